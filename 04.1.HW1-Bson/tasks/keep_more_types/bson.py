@@ -167,38 +167,37 @@ def create_nt_par():
         nt_par[key] = np(val['name'], val['fields'], defaults=val['defaults'].values())
 
 
-def parse_dict_nt(a: Any, start=False) -> Any:
-    r = {}
-    for i, j in a.items():
-        r[i] = j
-        if type(j) in [tuple, list]:
-            r[i] = parse_list_nt(j)
-        elif type(j) is dict:
-            r[i] = parse_dict_nt(j)
-        if id(j) in nt_dict:
-            r[i] = parse_nt(r[i], nt_dict[id(j)])
-            del nt_dict[id(j)]
-
-    if 'self' in nt_types and start:
-        r = parse_nt(r, nt_types['self'])
+def finish_nt(j: Any, done: dict[int, Any]) -> Any:
+    r = done.get(id(j), j)
+    if id(j) in nt_dict:
+        r = parse_nt(r, nt_dict.pop(id(j)))
     return r
 
 
-def parse_list_nt(a: Any) -> Any:
-    r = [Any] * len(a)
-    for i in range(len(a)):
-        j = a[i]
-        r[i] = j
-        if type(j) in [tuple, list]:
-            r[i] = parse_list_nt(j)
-        elif type(j) is dict:
-            r[i] = parse_dict_nt(j)
-        if id(j) in nt_dict:
-            r[i] = parse_nt(r[i], nt_dict[id(j)])
-            del nt_dict[id(j)]
-
-    if type(a) is tuple:
-        r = tuple(r)
+def parse_dict_nt(a: Any, start=False) -> Any:
+    done: dict[int, Any] = {}
+    stack: list[tuple[Any, bool]] = [(a, False)]
+    while stack:
+        node, expanded = stack.pop()
+        t = type(node)
+        if expanded:
+            if t is dict:
+                done[id(node)] = {k: finish_nt(v, done) for k, v in node.items()}
+            else:
+                tmp = [finish_nt(v, done) for v in node]
+                done[id(node)] = tuple(tmp) if t is tuple else tmp
+        else:
+            if id(node) in done:
+                continue
+            stack.append((node, True))
+            for c in (node.values() if t is dict else node):
+                tc = type(c)
+                if tc is dict or tc is list or tc is tuple:
+                    stack.append((c, False))
+
+    r = done[id(a)]
+    if 'self' in nt_types and start:
+        r = parse_nt(r, nt_types['self'])
     return r
 
 
@@ -246,22 +245,22 @@ def read(a: bytes, ind: int) -> tuple[dict[str, Any] | None, int]:
 
     elif num == 4:
         dc, ind = read_doc(a, ind, True)
-        if dc.keys():
+        if dc:
             keep = bytearray(b'')
             nm = '__metadata__'
-            if nm in dc.keys() and keep_types1:
+            if nm in dc and keep_types1:
                 if type(dc[nm]) is bytearray:
                     keep = dc[nm]
                     del dc[nm]
-            for i in dc.keys():
+            for i in dc:
                 if not i.isdigit() or len(i) == 0:
                     raise BsonBadArrayIndexError
                 elif i[0] == '0' and len(i) > 1:
                     raise BsonBadArrayIndexError
-            val = [None] * (max(map(int, dc.keys())) + 1)
+            val = [None] * (max(map(int, dc)) + 1)
             for i, j in dc.items():
                 val[int(i)] = j
-            if python_only and len(val) != len(dc.keys()):
+            if python_only and len(val) != len(dc):
                 raise BsonInvalidArrayError
             if keep_types1:
                 val = parse_keep_list(val, keep)
@@ -330,7 +329,7 @@ def parse_metadata(a: bytearray) -> str:
     if a[0] == 0:
         global nt_types
         nt_types, _ = read_doc(bytes(a), 1)
-        if 'children' in nt_types.keys():
+        if 'children' in nt_types:
             return nt_types['children']
         else:
             return ''
@@ -355,14 +354,17 @@ def parse_keep_list(a: list[Any], keep_inp: bytearray) -> list[Any]:
 def parse_keep_dict(a: list[tuple[str, Any]]) -> dict[str, Any]:
     nm = '__metadata__'
     keep = []
-    for key in a:
-        if key[0] == nm and type(key[1]) is bytearray:
-            keep = parse_metadata(key[1]).split(':')
-            a.remove(key)
+    skip = -1
+    for pos, (key, val) in enumerate(a):
+        if key == nm and type(val) is bytearray:
+            keep = parse_metadata(val).split(':')
+            skip = pos
             break
     r = {}
     ind = 0
-    for key, val in a:
+    for pos, (key, val) in enumerate(a):
+        if pos == skip:
+            continue
         if type(val) is list and ind < len(keep):
             if keep[ind] == '':
                 r[key] = val
@@ -410,15 +412,16 @@ def read_doc(a: bytes, ind: int = 0, is_list: bool = False) -> tuple[dict[str, A
             if python_only:
                 raise BsonInvalidElementTypeError
             continue
-        if list(q.keys())[0] == '__metadata__' and type(list(q.values())[0]) is bytearray and not is_list:
+        name = next(iter(q))
+        if name == '__metadata__' and type(q[name]) is bytearray and not is_list:
             if keep_types1:
-                r1.append((list(q.keys())[0], list(q.values())[0]))
+                r1.append((name, q[name]))
         else:
-            if list(q.keys())[0] in r.keys():
+            if name in r:
                 raise BsonRepeatedKeyDataError
-            r.update(q)
+            r[name] = q[name]
             if keep_types1:
-                r1.append((list(q.keys())[0], list(q.values())[0]))
+                r1.append((name, q[name]))
 
         if ind >= mx:
             raise BsonBrokenDataError
@@ -436,7 +439,7 @@ def read_doc(a: bytes, ind: int = 0, is_list: bool = False) -> tuple[dict[str, A
         raise BsonTooManyDataError
 
 
-vis = []
+vis: set[int] = set()
 nt_mas = {}
 c_mt = 0
 
@@ -444,28 +447,46 @@ c_mt = 0
 def marshal(data: dict[str, Any], kepp_types=False) -> bytes:
     global vis, keep_types1, nt_mas, c_mt
     keep_types1 = kepp_types
-    vis = []
+    vis = set()
     nt_mas = {}
     c_mt = 0
 
-    if is_valid_dict(data):
-        if is_nt(data):
-            return to_nt(data)
-        elif is_dt(data):
-            return to_dt(data)
-        elif is_prop(data):
-            return to_prop(data)
-        else:
-            tmp = to_document(data)
-            return tmp
+    cls = classify(data)
+    if cls == CLS_NT:
+        return to_nt(data)
+    elif cls == CLS_DT:
+        return to_dt(data)
+    elif cls == CLS_PROP:
+        return to_prop(data)
+    elif cls == CLS_DICT:
+        return to_document(data)
     else:
         raise BsonUnsupportedObjectError
 
 
+CLS_INVALID, CLS_PRIM, CLS_DICT, CLS_NT, CLS_DT, CLS_PROP = range(6)
+
+prim_types = frozenset(
+    [float, int, bool, bytes, bytearray, datetime, list, tuple, str, type(None)])
+
+
+def classify(a: Any) -> int:
+    t = type(a)
+    if t in prim_types:
+        return CLS_PRIM
+    if t is dict:
+        return CLS_DICT
+    if isinstance(a, tuple) and hasattr(a, '_fields') and hasattr(a, '_asdict'):
+        return CLS_NT
+    if is_dataclass(a):
+        return CLS_DT
+    if is_prop(a):
+        return CLS_PROP
+    return CLS_INVALID
+
+
 def is_valid_dict(a: Any) -> bool:
-    if type(a) is dict:
-        return True
-    return is_nt(a) or is_dt(a) or is_prop(a)
+    return classify(a) in (CLS_DICT, CLS_NT, CLS_DT, CLS_PROP)
 
 
 def is_nt(a: Any) -> bool:
@@ -486,23 +507,19 @@ def is_prop(a: Any) -> bool:
 
 
 def is_valid_type(a: Any) -> bool:
-    my_types = [float, int, bool, bytes, bytearray, datetime, dict, list, tuple, str]
-    if type(a) in my_types or a is None:
-        return True
-    return is_valid_dict(a)
+    return classify(a) != CLS_INVALID
+
+
+int32_min, int32_max = -(1 << 31), (1 << 31) - 1
+int64_min, int64_max = -(1 << 63), (1 << 63) - 1
 
 
 def my_is_int32(n):
-    from struct import error
-    try:
-        struct.pack("i", n)
-    except error:
-        try:
-            struct.pack('q', n)
-        except error:
-            raise BsonIntegerTooBigError
+    if int32_min <= n <= int32_max:
+        return True
+    if int64_min <= n <= int64_max:
         return False
-    return True
+    raise BsonIntegerTooBigError
 
 
 def cor_document(a: dict[str, Any]) -> None:
@@ -510,7 +527,7 @@ def cor_document(a: dict[str, Any]) -> None:
         if type(key) is not str:
             raise BsonUnsupportedKeyError
     for key in a.keys():
-        if b'\x00' in key.encode('utf-8'):
+        if '\x00' in key:
             raise BsonKeyWithZeroByteError
     for val in a.values():
         if not is_valid_type(val):
@@ -570,27 +587,35 @@ def form_keep(a: list[str], is_self=False) -> bytes:
             struct.pack('<i', len(r)) + my_type_2.to_bytes() + r)
 
 
+prop_cache: dict[type, list[str]] = {}
+
+
+def prop_names(cls: type) -> list[str]:
+    names = prop_cache.get(cls)
+    if names is None:
+        try:
+            names = [n for n in dir(cls) if isinstance(getattr(cls, n), property)]
+        except TypeError:
+            names = []
+        prop_cache[cls] = names
+    return names
+
+
 def find_p(obj: Any) -> list[tuple[str, Any]]:
-    try:
-        r = []
-        for attr_name in dir(type(obj)):
-            attr = getattr(type(obj), attr_name)
-            if isinstance(attr, property):
-                try:
-                    value = getattr(obj, attr_name)
-                    r.append((attr_name, value))
-                except ValueError:
-                    pass
-        return r
-    except TypeError:
-        return []
+    r = []
+    for attr_name in prop_names(type(obj)):
+        try:
+            r.append((attr_name, getattr(obj, attr_name)))
+        except ValueError:
+            pass
+    return r
 
 
 def to_prop(a: Any) -> bytes:
     if id(a) in vis:
         raise BsonCycleDetectedError
     else:
-        vis.append(id(a))
+        vis.add(id(a))
     tmp = to_document(dict(find_p(a)))
     vis.remove(id(a))
     return tmp
@@ -603,7 +628,7 @@ def to_dt(a: Any) -> bytes:
     if id(a) in vis:
         raise BsonCycleDetectedError
     else:
-        vis.append(id(a))
+        vis.add(id(a))
 
     keep = []
     for name, val in a.items():
@@ -629,7 +654,7 @@ def to_document(a: dict[str, Any]) -> bytes:
     if id(a) in vis:
         raise BsonCycleDetectedError
     else:
-        vis.append(id(a))
+        vis.add(id(a))
 
     keep = []
     for name, val in sorted(a.items()):
@@ -662,7 +687,7 @@ def to_nt(a: Any) -> bytes:
     if id(a) in vis:
         raise BsonCycleDetectedError
     else:
-        vis.append(id(a))
+        vis.add(id(a))
 
     keep = []
     for name, val in zip(a._fields, a):
@@ -683,7 +708,32 @@ def to_nt(a: Any) -> bytes:
     return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
 
 
+index_prefix_cache: list[bytes] = []
+
+
+def index_prefix(i: int) -> bytes:
+    while len(index_prefix_cache) <= i:
+        n = len(index_prefix_cache)
+        index_prefix_cache.append(b'\x01' + str(n).encode() + b'\x00')
+    return index_prefix_cache[i]
+
+
+def to_list_floats(a: list[Any] | tuple[Any]) -> bytes:
+    data = struct.pack('<%dd' % len(a), *a)
+    parts = []
+    for i in range(len(a)):
+        parts.append(index_prefix(i))
+        parts.append(data[8 * i:8 * i + 8])
+    r = b''.join(parts)
+    if keep_types1:
+        r += form_keep([''] * len(a))
+    return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
+
+
 def to_list(a: list[Any] | tuple[Any]) -> bytes:
+    if a and type(a[0]) is float and all(type(x) is float for x in a):
+        return to_list_floats(a)
+
     r = b''
     keep = []
     for i in range(len(a)):
@@ -700,62 +750,102 @@ def to_list(a: list[Any] | tuple[Any]) -> bytes:
     return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
 
 
+def elem_float(a: Any) -> tuple[int, bytes]:
+    return 1, struct.pack('<d', a)
+
+
+def elem_int(a: Any) -> tuple[int, bytes]:
+    if my_is_int32(a):
+        return 16, struct.pack('<i', a)
+    return 18, struct.pack('<q', a)
+
+
+def elem_bool(a: Any) -> tuple[int, bytes]:
+    return 8, int(a).to_bytes()
+
+
+def elem_datetime(a: Any) -> tuple[int, bytes]:
+    return 9, struct.pack('<q', int(a.timestamp() * 1000))
+
+
+def elem_binary(a: Any) -> tuple[int, bytes]:
+    if not my_is_int32(len(a)):
+        raise BsonBinaryTooBigError
+    return 5, struct.pack('<i', len(a)) + b'\x00' + bytes(a)
+
+
+def elem_dict(a: Any) -> tuple[int, bytes]:
+    return 3, to_document(a)
+
+
+def elem_list(a: Any) -> tuple[int, bytes]:
+    if id(a) in vis:
+        raise BsonCycleDetectedError
+    else:
+        vis.add(id(a))
+    r = to_list(a)
+    vis.remove(id(a))
+    return 4, r
+
+
+def elem_str(a: Any) -> tuple[int, bytes]:
+    en_a = a.encode(encoding='utf-8')
+    if not my_is_int32(len(en_a)):
+        raise BsonStringTooBigError
+    return 2, struct.pack('<i', len(en_a) + 1) + en_a + b'\x00'
+
+
+def elem_none(a: Any) -> tuple[int, bytes]:
+    return 10, b''
+
+
+name_cache: dict[str, bytes] = {}
+
+
+def enc_name(name: str) -> bytes:
+    b = name_cache.get(name)
+    if b is None:
+        if len(name_cache) > 4096:
+            name_cache.clear()
+        b = name.encode('utf-8') + b'\x00'
+        name_cache[name] = b
+    return b
+
+
+elem_encoders = {
+    float: elem_float,
+    int: elem_int,
+    bool: elem_bool,
+    datetime: elem_datetime,
+    bytearray: elem_binary,
+    bytes: elem_binary,
+    dict: elem_dict,
+    list: elem_list,
+    tuple: elem_list,
+    str: elem_str,
+    type(None): elem_none,
+}
+
+
 def to_elem(name: str, a: Any) -> bytes:
-    if type(a) is float:
-        my_type = 1
-        r = struct.pack('<d', a)
-    elif type(a) is int:
-        if my_is_int32(a):
-            my_type = 16
-            r = struct.pack('<i', a)
-        else:
-            my_type = 18
-            r = struct.pack('<q', a)
-    elif type(a) is bool:
-        my_type = 8
-        r = int(a).to_bytes()
-    elif type(a) is datetime:
-        my_type = 9
-        r = struct.pack('<q', int(a.timestamp() * 1000))
-    elif type(a) is bytearray or type(a) is bytes:
-        my_type = 5
-        if not my_is_int32(len(a)):
-            raise BsonBinaryTooBigError
-        r = struct.pack('<i', len(a)) + b'\x00' + bytes(a)
-    elif type(a) is dict:
-        my_type = 3
-        r = to_document(a)
-    elif type(a) is list or type(a) is tuple:
-        if id(a) in vis:
-            raise BsonCycleDetectedError
-        else:
-            vis.append(id(a))
-        my_type = 4
-        r = to_list(a)
-        vis.remove(id(a))
-    elif type(a) is str:
-        my_type = 2
-        en_a = a.encode(encoding='utf-8')
-        if not my_is_int32(len(en_a)):
-            raise BsonStringTooBigError
-        r = struct.pack('<i', len(en_a) + 1) + en_a + b'\x00'
-    elif a is None:
-        my_type = 10
-        r = b''
+    enc = elem_encoders.get(type(a))
+    if enc is not None:
+        my_type, r = enc(a)
     else:
-        if is_nt(a):
+        cls = classify(a)
+        if cls == CLS_NT:
             my_type = 3
             r = to_nt(a)
-        elif is_dt(a):
+        elif cls == CLS_DT:
             my_type = 3
             r = to_dt(a)
-        elif is_prop(a):
+        elif cls == CLS_PROP:
             my_type = 3
             r = to_prop(a)
         else:
             raise BsonUnsupportedObjectError
 
-    return my_type.to_bytes() + name.encode() + b'\x00' + r
+    return my_type.to_bytes() + enc_name(name) + r
 
 
 class Mapper:
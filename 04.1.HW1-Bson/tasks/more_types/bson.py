@@ -6,6 +6,12 @@ from dataclasses import is_dataclass
 
 PROMPT = '>>> '
 
+s_int32 = struct.Struct('<i')
+s_int64 = struct.Struct('<q')
+s_double = struct.Struct('<d')
+
+tags = tuple(bytes((i,)) for i in range(256))
+
 
 def run_calc(context: dict[str, Any] | None = None) -> None:
     """Run interactive calculator session in specified namespace"""
@@ -130,18 +136,25 @@ class MapperUnsupportedOptionError(ValueError):
 
 python_only = False
 keep_types1 = False
+validate_utf8 = True
+str_codec = 'utf-8'
 
 
 def unmarshal(data: bytes) -> dict[str, Any]:
+    global str_codec
+    if not validate_utf8:
+        str_codec = 'latin-1'
+    elif data.isascii():
+        str_codec = 'ascii'
+    else:
+        str_codec = 'utf-8'
     return read_doc(data, 0, False)[0]
 
 
 def read_cs_string(a: bytes, ind: int, is_key: bool) -> tuple[str, int]:
-    d = 0
-    while a[ind + d] != 0:
-        d += 1
     try:
-        return a[ind:ind + d].decode(encoding='utf-8'), ind + d + 1
+        end = a.index(0, ind)
+        return a[ind:end].decode(str_codec), end + 1
     except Exception:
         if is_key:
             raise BsonBadKeyDataError
@@ -150,14 +163,14 @@ def read_cs_string(a: bytes, ind: int, is_key: bool) -> tuple[str, int]:
 
 
 def read_string(a: bytes, ind: int) -> tuple[str, int]:
-    dl, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 4
+    dl, ind = s_int32.unpack_from(a, ind)[0], ind + 4
     if dl < 1:
         raise BsonStringSizeError
     global doc_size
     if ind + dl >= doc_size:
         raise BsonInconsistentStringSizeError
     try:
-        r = a[ind:ind + dl - 1].decode(encoding='utf-8')
+        r = a[ind:ind + dl - 1].decode(str_codec)
         if a[ind + dl - 1] != 0:
             raise BsonBrokenDataError
         return r, ind + dl
@@ -165,96 +178,170 @@ def read_string(a: bytes, ind: int) -> tuple[str, int]:
         raise BsonBadStringDataError
 
 
-def read(a: bytes, ind: int) -> tuple[dict[str, Any] | None, int]:
+skip_element = object()
+
+
+def read_double_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return s_double.unpack_from(a, ind)[0], ind + 8
+
+
+def read_string_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return read_string(a, ind)
+
+
+def read_doc_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return read_doc(a, ind, False)
+
+
+def read_array_el(a: bytes, ind: int) -> tuple[Any, int]:
+    dc, ind = read_doc(a, ind, True)
+    if not dc:
+        return [], ind
+    keep = bytearray(b'')
+    nm = '__metadata__'
+    if nm in dc and keep_types1:
+        if type(dc[nm]) is bytearray:
+            keep = dc[nm]
+            del dc[nm]
+    items = list(dc.items())
+    indices = []
+    mx = -1
+    for i, j in items:
+        if not i.isdigit() or (i[0] == '0' and len(i) > 1):
+            raise BsonBadArrayIndexError
+        idx = int(i)
+        indices.append(idx)
+        if idx > mx:
+            mx = idx
+    val = [None] * (mx + 1)
+    for idx, (_, j) in zip(indices, items):
+        val[idx] = j
+    if python_only and len(val) != len(items):
+        raise BsonInvalidArrayError
+    if keep_types1:
+        val = parse_keep_list(val, keep)
+    return val, ind
+
+
+def read_binary_el(a: bytes, ind: int) -> tuple[Any, int]:
+    col, ind = s_int32.unpack_from(a, ind)[0], ind + 5
+    if keep_types1 and a[ind - 1] == 128:
+        return bytearray(a[ind:ind + col]), ind + col
+    elif a[ind - 1] == 0:
+        return bytes(a[ind:ind + col]), ind + col
+    elif 9 < a[ind - 1] < 128:
+        raise BsonInvalidBinarySubtypeError
+    else:
+        if python_only:
+            raise BsonInvalidBinarySubtypeError
+        return skip_element, ind + col
+
+
+def read_objectid_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return skip_element, ind + 12
+
+
+def read_bool_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return bool(a[ind]), ind + 1
+
+
+def read_datetime_el(a: bytes, ind: int) -> tuple[Any, int]:
+    val = s_int64.unpack_from(a, ind)[0]
+    return datetime.fromtimestamp(val / 1000.0, tz=timezone.utc), ind + 8
+
+
+def read_none_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return None, ind
+
+
+def read_regex_el(a: bytes, ind: int) -> tuple[Any, int]:
+    _, ind = read_cs_string(a, ind, False)
+    _, ind = read_cs_string(a, ind, False)
+    return skip_element, ind
+
+
+def read_dbpointer_el(a: bytes, ind: int) -> tuple[Any, int]:
+    _, ind = read_string(a, ind)
+    return skip_element, ind + 12
+
+
+def read_skip_string_el(a: bytes, ind: int) -> tuple[Any, int]:
+    _, ind = read_string(a, ind)
+    return skip_element, ind
+
+
+def read_js_scope_el(a: bytes, ind: int) -> tuple[Any, int]:
+    _, ind = read_string(a, ind)
+    _, ind = read_doc(a, ind, False)
+    return skip_element, ind
+
+
+def read_int32_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return int.from_bytes(a[ind:ind + 4], 'little', signed=True), ind + 4
+
+
+def read_timestamp_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return skip_element, ind + 8
+
+
+def read_int64_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return int.from_bytes(a[ind:ind + 8], 'little', signed=True), ind + 8
+
+
+def read_decimal128_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return skip_element, ind + 16
+
+
+def read_skip_el(a: bytes, ind: int) -> tuple[Any, int]:
+    return skip_element, ind
+
+
+read_handlers: list[Any] = [None] * 256
+read_handlers[1] = read_double_el
+read_handlers[2] = read_string_el
+read_handlers[3] = read_doc_el
+read_handlers[4] = read_array_el
+read_handlers[5] = read_binary_el
+read_handlers[6] = read_skip_el
+read_handlers[7] = read_objectid_el
+read_handlers[8] = read_bool_el
+read_handlers[9] = read_datetime_el
+read_handlers[10] = read_none_el
+read_handlers[11] = read_regex_el
+read_handlers[12] = read_dbpointer_el
+read_handlers[13] = read_skip_string_el
+read_handlers[14] = read_skip_string_el
+read_handlers[15] = read_js_scope_el
+read_handlers[16] = read_int32_el
+read_handlers[17] = read_timestamp_el
+read_handlers[18] = read_int64_el
+read_handlers[19] = read_decimal128_el
+read_handlers[127] = read_skip_el
+read_handlers[255] = read_skip_el
+
+
+def read(a: bytes, ind: int, out: dict[str, Any], meta: list[tuple[str, Any]],
+         is_list: bool, handlers: list[Any] = read_handlers) -> int:
     num = a[ind]
     name, ind = read_cs_string(a, ind + 1, True)
-    val = ''
-
-    if num == 1:
-        val = struct.unpack('<d', a[ind:ind + 8])[0]
-        ind += 8
-    elif num == 2:
-        val, ind = read_string(a, ind)
-    elif num == 3:
-        val, ind = read_doc(a, ind, False)
-
-    elif num == 4:
-        dc, ind = read_doc(a, ind, True)
-        if dc.keys():
-            keep = bytearray(b'')
-            nm = '__metadata__'
-            if nm in dc.keys() and keep_types1:
-                if type(dc[nm]) is bytearray:
-                    keep = dc[nm]
-                    del dc[nm]
-            for i in dc.keys():
-                if not i.isdigit() or len(i) == 0:
-                    raise BsonBadArrayIndexError
-                elif i[0] == '0' and len(i) > 1:
-                    raise BsonBadArrayIndexError
-            val = [None] * (max(map(int, dc.keys())) + 1)
-            for i, j in dc.items():
-                val[int(i)] = j
-            if python_only and len(val) != len(dc.keys()):
-                raise BsonInvalidArrayError
-            if keep_types1:
-                val = parse_keep_list(val, keep)
-        else:
-            val = []
-    elif num == 5:
-        col, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 5
-        if keep_types1 and a[ind - 1] == 128:
-            val, ind = bytearray(a[ind:ind + col]), ind + col
-        elif a[ind - 1] == 0:
-            val, ind = bytes(a[ind:ind + col]), ind + col
-        elif 9 < a[ind - 1] < 128:
-            raise BsonInvalidBinarySubtypeError
-        elif a[ind - 1] != 0:
-            if python_only:
-                raise BsonInvalidBinarySubtypeError
-            return None, ind + col
-    elif num == 6:
-        return None, ind
-    elif num == 7:
-        val, ind = a[ind:ind + 12], ind + 12
-        return None, ind
-    elif num == 8:
-        val, ind = bool(a[ind]), ind + 1
-    elif num == 9:
-        val, ind = struct.unpack('<q', a[ind:ind + 8])[0], ind + 8
-        val = datetime.fromtimestamp(val / 1000.0, tz=timezone.utc)
-    elif num == 10:
-        val, ind = None, ind
-    elif num == 11:
-        _, ind = read_cs_string(a, ind, False)
-        _, ind = read_cs_string(a, ind, False)
-        return None, ind
-    elif num == 12:
-        _, ind = read_string(a, ind)
-        return None, ind + 12
-    elif num == 13:
-        _, ind = read_string(a, ind)
-        return None, ind
-    elif num == 14:
-        _, ind = read_string(a, ind)
-        return None, ind
-    elif num == 15:
-        _, ind = read_string(a, ind)
-        _, ind = read_doc(a, ind, False)
-        return None, ind
-    elif num == 16:
-        val, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 4
-    elif num == 17:
-        return None, ind + 8
-    elif num == 18:
-        val, ind = struct.unpack('<q', a[ind:ind + 8])[0], ind + 8
-    elif num == 19:
-        return None, ind + 16
-    elif num == 127 or num == 255:
-        return None, ind
-    else:
+    handler = handlers[num]
+    if handler is None:
         raise BsonInvalidElementTypeError
-    return {name: val}, ind
+    val, ind = handler(a, ind)
+    if val is skip_element:
+        if python_only:
+            raise BsonInvalidElementTypeError
+        return ind
+    if name == '__metadata__' and type(val) is bytearray and not is_list:
+        if keep_types1:
+            meta.append((name, val))
+    else:
+        if name in out:
+            raise BsonRepeatedKeyDataError
+        out[name] = val
+        if keep_types1:
+            meta.append((name, val))
+    return ind
 
 
 doc_size = 99999999999
@@ -264,10 +351,6 @@ def parse_keep_list(a: list[Any], keep_inp: bytearray) -> list[Any]:
     if keep_inp == bytearray(b''):
         return a
     keep = keep_inp.decode('utf-8').split(':')
-    print('parse_list')
-    print(a)
-    print(keep)
-    print('parse_list')
     for i in range(len(a)):
         if type(a[i]) is list and keep[i] != '':
             a[i] = tuple(a[i])
@@ -277,7 +360,6 @@ def parse_keep_list(a: list[Any], keep_inp: bytearray) -> list[Any]:
 
 
 def parse_keep_dict(a: list[tuple[str, Any]]) -> dict[str, Any]:
-    print(a)
     nm = '__metadata__'
     keep = []
     for key in a:
@@ -305,19 +387,20 @@ def parse_keep_dict(a: list[tuple[str, Any]]) -> dict[str, Any]:
     return r
 
 
-def read_doc(a: bytes, ind: int = 0, is_list: bool = False) -> tuple[dict[str, Any], int]:
-    if len(a[ind:]) < 4:
+def read_doc(a: bytes, ind: int = 0, is_list: bool = False,
+             read_el: Any = read) -> tuple[dict[str, Any], int]:
+    if len(a) - ind < 4:
         raise BsonBrokenDataError
-    size, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 4
+    size, ind = s_int32.unpack_from(a, ind)[0], ind + 4
     r = {}
     r1 = []
     if size == -1:
         raise BsonNotEnoughDataError
     if size < 4:
         raise BsonIncorrectSizeError
-    if len(a[ind - 4:]) > size and ind == 4:
+    if len(a) - (ind - 4) > size and ind == 4:
         raise BsonTooManyDataError
-    elif len(a[ind - 4:]) < size:
+    elif len(a) - (ind - 4) < size:
         raise BsonNotEnoughDataError
 
     mx = ind - 4 + size
@@ -325,21 +408,7 @@ def read_doc(a: bytes, ind: int = 0, is_list: bool = False) -> tuple[dict[str, A
     b_d = doc_size
     doc_size = mx
     while ind < mx - 1:
-        q, ind = read(a, ind)
-        if q is None:
-            if python_only:
-                raise BsonInvalidElementTypeError
-            continue
-        if list(q.keys())[0] == '__metadata__' and type(list(q.values())[0]) is bytearray and not is_list:
-            if keep_types1:
-                r1.append((list(q.keys())[0], list(q.values())[0]))
-        else:
-            if list(q.keys())[0] in r.keys():
-                raise BsonRepeatedKeyDataError
-            r.update(q)
-            if keep_types1:
-                r1.append((list(q.keys())[0], list(q.values())[0]))
-
+        ind = read_el(a, ind, r, r1, is_list)
         if ind >= mx:
             raise BsonBrokenDataError
     doc_size = b_d
@@ -355,22 +424,18 @@ def read_doc(a: bytes, ind: int = 0, is_list: bool = False) -> tuple[dict[str, A
         raise BsonTooManyDataError
 
 
-vis = []
-
-
 def marshal(data: dict[str, Any]) -> bytes:
-    global vis
-    vis = []
+    vis: set[int] = set()
 
     if is_valid_dict(data):
         if is_nt(data):
-            return to_nt(data)
+            return to_nt(data, vis)
         elif is_dt(data):
-            return to_dt(data)
+            return to_dt(data, vis)
         elif is_prop(data):
-            return to_prop(data)
+            return to_prop(data, vis)
         else:
-            return to_document(data)
+            return to_document(data, vis)
     else:
         raise BsonUnsupportedObjectError
 
@@ -405,29 +470,32 @@ def is_valid_type(a: Any) -> bool:
     return is_valid_dict(a)
 
 
+int32_min, int32_max = -(1 << 31), (1 << 31) - 1
+int64_min, int64_max = -(1 << 63), (1 << 63) - 1
+
+
 def my_is_int32(n):
-    from struct import error
-    try:
-        struct.pack("i", n)
-    except error:
-        try:
-            struct.pack('q', n)
-        except error:
-            raise BsonIntegerTooBigError
+    if int32_min <= n <= int32_max:
+        return True
+    if int64_min <= n <= int64_max:
         return False
-    return True
+    raise BsonIntegerTooBigError
 
 
 def cor_document(a: dict[str, Any]) -> None:
-    for key in a.keys():
+    zero_key = False
+    bad_val = False
+    for key, val in a.items():
         if type(key) is not str:
             raise BsonUnsupportedKeyError
-    for key in a.keys():
-        if b'\x00' in key.encode('utf-8'):
-            raise BsonKeyWithZeroByteError
-    for val in a.values():
-        if not is_valid_type(val):
-            raise BsonUnsupportedObjectError
+        if not zero_key and '\x00' in key:
+            zero_key = True
+        if not bad_val and not is_valid_type(val):
+            bad_val = True
+    if zero_key:
+        raise BsonKeyWithZeroByteError
+    if bad_val:
+        raise BsonUnsupportedObjectError
 
 
 def to_keep(a: Any) -> str | None:
@@ -444,12 +512,11 @@ def to_keep(a: Any) -> str | None:
 def form_keep(a: list[str]) -> bytes:
     my_type = 5
     my_type_2 = 128
-    print(a)
     r = ':'.join(a).encode('utf_8')
     if len(r) == 0:
         return b''
-    return (my_type.to_bytes() + '__metadata__'.encode('utf-8') + b'\x00' +
-            struct.pack('<i', len(r)) + my_type_2.to_bytes() + r)
+    return (tags[my_type] + '__metadata__'.encode('utf-8') + b'\x00' +
+            s_int32.pack(len(r)) + tags[my_type_2] + r)
 
 
 def find_p(obj: Any) -> list[tuple[str, Any]]:
@@ -468,147 +535,198 @@ def find_p(obj: Any) -> list[tuple[str, Any]]:
         return []
 
 
-def to_prop(a: Any) -> bytes:
+def to_prop(a: Any, vis: set[int]) -> bytes:
     if id(a) in vis:
         raise BsonCycleDetectedError
     else:
-        vis.append(id(a))
-    tmp = to_document(dict(find_p(a)))
+        vis.add(id(a))
+    tmp = to_document(dict(find_p(a)), vis)
     vis.remove(id(a))
     return tmp
 
 
-def to_dt(a: Any) -> bytes:
+def to_dt(a: Any, vis: set[int]) -> bytes:
     a = a.__dict__
     cor_document(a)
-    r = b''
     if id(a) in vis:
         raise BsonCycleDetectedError
     else:
-        vis.append(id(a))
+        vis.add(id(a))
 
+    parts = []
+    total = 0
     for name, val in a.items():
-        r += to_elem(name, val)
-        if not my_is_int32(len(r)):
+        e = to_elem(name, val, vis)
+        parts.append(e)
+        total += len(e)
+        if total > int32_max:
             raise BsonDocumentTooBigError
+    r = b''.join(parts)
 
     vis.remove(id(a))
-    return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
+    return s_int32.pack((len(r) + 5)) + r + b'\x00'
 
 
-def to_document(a: dict[str, Any]) -> bytes:
+def to_document(a: dict[str, Any], vis: set[int]) -> bytes:
     cor_document(a)
-    r = b''
     if id(a) in vis:
         raise BsonCycleDetectedError
     else:
-        vis.append(id(a))
+        vis.add(id(a))
 
     keep = []
-    for name, val in sorted(a.items()):
-        r += to_elem(name, val)
-        if not my_is_int32(len(r)):
+    parts = []
+    total = 0
+    for name in sorted(a):
+        val = a[name]
+        e = to_elem(name, val, vis)
+        parts.append(e)
+        total += len(e)
+        if total > int32_max:
             raise BsonDocumentTooBigError
         tmp = to_keep(val)
         if tmp is not None:
             keep.append(tmp)
+    r = b''.join(parts)
 
     if keep_types1 and len(keep) > 0:
         r += form_keep(keep)
 
     vis.remove(id(a))
-    return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
+    return s_int32.pack((len(r) + 5)) + r + b'\x00'
 
 
-def to_nt(a: Any) -> bytes:
+def to_nt(a: Any, vis: set[int]) -> bytes:
     cor_document(dict(zip(a._fields, a)))
-    r = b''
     if id(a) in vis:
         raise BsonCycleDetectedError
     else:
-        vis.append(id(a))
+        vis.add(id(a))
 
+    parts = []
+    total = 0
     for name, val in zip(a._fields, a):
-        r += to_elem(name, val)
-        if not my_is_int32(len(r)):
+        e = to_elem(name, val, vis)
+        parts.append(e)
+        total += len(e)
+        if total > int32_max:
             raise BsonDocumentTooBigError
+    r = b''.join(parts)
 
     # r += to_elem('_fields', a._fields)
     vis.remove(id(a))
-    return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
+    return s_int32.pack((len(r) + 5)) + r + b'\x00'
 
 
-def to_list(a: list[Any] | tuple[Any]) -> bytes:
-    r = b''
+def to_list(a: list[Any] | tuple[Any], vis: set[int]) -> bytes:
+    parts = []
     keep = []
     for i in range(len(a)):
         name, val = str(i), a[i]
-        r += to_elem(name, val)
+        parts.append(to_elem(name, val, vis))
         tmp = to_keep(val)
         if tmp is None:
             tmp = ''
         keep.append(tmp)
+    r = b''.join(parts)
     if keep_types1 and len(keep) > 0:
         r += form_keep(keep)
-    return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
+    return s_int32.pack((len(r) + 5)) + r + b'\x00'
 
 
-def to_elem(name: str, a: Any) -> bytes:
-    if type(a) is float:
-        my_type = 1
-        r = struct.pack('<d', a)
-    elif type(a) is int:
-        if my_is_int32(a):
-            my_type = 16
-            r = struct.pack('<i', a)
-        else:
-            my_type = 18
-            r = struct.pack('<q', a)
-    elif type(a) is bool:
-        my_type = 8
-        r = int(a).to_bytes()
-    elif type(a) is datetime:
-        my_type = 9
-        r = struct.pack('<q', int(a.timestamp() * 1000))
-    elif type(a) is bytearray or type(a) is bytes:
-        my_type = 5
-        if not my_is_int32(len(a)):
-            raise BsonBinaryTooBigError
-        r = struct.pack('<i', len(a)) + b'\x00' + bytes(a)
-    elif type(a) is dict:
+def elem_float(a: Any, vis: set[int]) -> tuple[int, bytes]:
+    return 1, s_double.pack(a)
+
+
+def elem_int(a: Any, vis: set[int]) -> tuple[int, bytes]:
+    if my_is_int32(a):
+        return 16, s_int32.pack(a)
+    return 18, s_int64.pack(a)
+
+
+def elem_bool(a: Any, vis: set[int]) -> tuple[int, bytes]:
+    return 8, tags[int(a)]
+
+
+def elem_datetime(a: Any, vis: set[int]) -> tuple[int, bytes]:
+    return 9, s_int64.pack(int(a.timestamp() * 1000))
+
+
+def elem_binary(a: Any, vis: set[int]) -> tuple[int, bytes]:
+    if not my_is_int32(len(a)):
+        raise BsonBinaryTooBigError
+    return 5, s_int32.pack(len(a)) + b'\x00' + bytes(a)
+
+
+def elem_dict(a: Any, vis: set[int]) -> tuple[int, bytes]:
+    return 3, to_document(a, vis)
+
+
+def elem_list(a: Any, vis: set[int]) -> tuple[int, bytes]:
+    if id(a) in vis:
+        raise BsonCycleDetectedError
+    else:
+        vis.add(id(a))
+    r = to_list(a, vis)
+    vis.remove(id(a))
+    return 4, r
+
+
+def elem_str(a: Any, vis: set[int]) -> tuple[int, bytes]:
+    en_a = a.encode(encoding='utf-8')
+    if not my_is_int32(len(en_a)):
+        raise BsonStringTooBigError
+    return 2, s_int32.pack(len(en_a) + 1) + en_a + b'\x00'
+
+
+def elem_none(a: Any, vis: set[int]) -> tuple[int, bytes]:
+    return 10, b''
+
+
+name_cache: dict[str, bytes] = {}
+
+
+def enc_name(name: str) -> bytes:
+    b = name_cache.get(name)
+    if b is None:
+        b = name.encode('utf-8') + b'\x00'
+        if len(name_cache) < 2048:
+            name_cache[name] = b
+    return b
+
+
+elem_encoders = {
+    float: elem_float,
+    int: elem_int,
+    bool: elem_bool,
+    datetime: elem_datetime,
+    bytearray: elem_binary,
+    bytes: elem_binary,
+    dict: elem_dict,
+    list: elem_list,
+    tuple: elem_list,
+    str: elem_str,
+    type(None): elem_none,
+}
+
+
+def to_elem(name: str, a: Any, vis: set[int]) -> bytes:
+    enc = elem_encoders.get(type(a))
+    if enc is not None:
+        my_type, r = enc(a, vis)
+    elif is_nt(a):
         my_type = 3
-        r = to_document(a)
-    elif type(a) is list or type(a) is tuple:
-        if id(a) in vis:
-            raise BsonCycleDetectedError
-        else:
-            vis.append(id(a))
-        my_type = 4
-        r = to_list(a)
-        vis.remove(id(a))
-    elif type(a) is str:
-        my_type = 2
-        en_a = a.encode(encoding='utf-8')
-        if not my_is_int32(len(en_a)):
-            raise BsonStringTooBigError
-        r = struct.pack('<i', len(en_a) + 1) + en_a + b'\x00'
-    elif a is None:
-        my_type = 10
-        r = b''
+        r = to_nt(a, vis)
+    elif is_dt(a):
+        my_type = 3
+        r = to_dt(a, vis)
+    elif is_prop(a):
+        my_type = 3
+        r = to_prop(a, vis)
     else:
-        if is_nt(a):
-            my_type = 3
-            r = to_nt(a)
-        elif is_dt(a):
-            my_type = 3
-            r = to_dt(a)
-        elif is_prop(a):
-            my_type = 3
-            r = to_prop(a)
-        else:
-            raise BsonUnsupportedObjectError
+        raise BsonUnsupportedObjectError
 
-    return my_type.to_bytes() + name.encode() + b'\x00' + r
+    return tags[my_type] + enc_name(name) + r
 
 
 class Mapper:
@@ -620,20 +738,23 @@ class Mapper:
     def unmarshal(self, data: bytes) -> dict[str, Any]:
         global python_only
         global keep_types1
+        global validate_utf8
         python_only = self.__python_only
-        keep_types = self.__keep_types
-        print(keep_types, self.keep_types, self.__keep_types)
+        validate_utf8 = self.__validate_utf8
         return unmarshal(data)
 
     def __init__(self, **kwargs):
         self.__keep_types = False
         self.__python_only = False
+        self.__validate_utf8 = True
 
         for key, val in kwargs.items():
             if key == 'python_only' and type(val) is bool:
                 self.__python_only = val
             elif key == 'keep_types' and type(val) is bool:
                 self.__keep_types = val
+            elif key == 'validate_utf8' and type(val) is bool:
+                self.__validate_utf8 = val
             else:
                 raise MapperConfigError
 
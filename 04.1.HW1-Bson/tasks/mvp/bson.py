@@ -5,6 +5,11 @@ from datetime import datetime, timezone
 
 PROMPT = '>>> '
 
+s_int32 = struct.Struct('<i')
+s_int64 = struct.Struct('<q')
+s_uint64 = struct.Struct('<Q')
+s_double = struct.Struct('<d')
+
 
 def run_calc(context: dict[str, Any] | None = None) -> None:
     """Run interactive calculator session in specified namespace"""
@@ -17,14 +22,12 @@ def unmarshal(data: bytes) -> dict[str, Any]:
 
 
 def read_cs_string(a: bytes, ind: int) -> tuple[str, int]:
-    d = 0
-    while a[ind + d] != 0:
-        d += 1
-    return a[ind:ind + d].decode(encoding='utf-8'), ind + d + 1
+    end = a.index(0, ind)
+    return a[ind:end].decode(encoding='utf-8'), end + 1
 
 
 def read_string(a: bytes, ind: int) -> tuple[str, int]:
-    dl, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 4
+    dl, ind = s_int32.unpack_from(a, ind)[0], ind + 4
     return a[ind:ind + dl - 1].decode(encoding='utf-8'), ind + dl
 
 
@@ -32,11 +35,8 @@ def read(a: bytes, ind: int) -> tuple[Any, int]:
     num = a[ind]
     name, ind = read_cs_string(a, ind + 1)
 
-    print()
-    print(name)
-
     if num == 1:
-        val = struct.unpack('<d', a[ind:ind + 8])[0]
+        val = s_double.unpack_from(a, ind)[0]
         ind += 8
     elif num == 2:
         val, ind = read_string(a, ind)
@@ -44,14 +44,15 @@ def read(a: bytes, ind: int) -> tuple[Any, int]:
         val, ind = read_doc(a, ind)
     elif num == 4:
         dc, ind = read_doc(a, ind)
-        if dc.keys():
-            val = [0] * (max(map(int, dc.keys())) + 1)
-            for i, j in dc.items():
-                val[int(i)] = j
+        if dc:
+            pairs = [(int(i), j) for i, j in dc.items()]
+            val = [0] * (max(p[0] for p in pairs) + 1)
+            for i, j in pairs:
+                val[i] = j
         else:
             val = []
     elif num == 5:
-        col, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 5
+        col, ind = s_int32.unpack_from(a, ind)[0], ind + 5
         val, ind = a[ind:ind + col], ind + col
     elif num == 6:
         val, ind = None, ind + 1
@@ -60,26 +61,24 @@ def read(a: bytes, ind: int) -> tuple[Any, int]:
     elif num == 8:
         val, ind = bool(a[ind]), ind + 1
     elif num == 9:
-        val, ind = struct.unpack('<q', a[ind:ind + 8])[0], ind + 8
+        val, ind = s_int64.unpack_from(a, ind)[0], ind + 8
         val = datetime.fromtimestamp(val / 1000.0, tz=timezone.utc)
     elif num == 10:
         val, ind = None, ind
     elif num == 16:
-        val, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 4
+        val, ind = s_int32.unpack_from(a, ind)[0], ind + 4
     elif num == 17:
-        val, ind = struct.unpack('<Q', a[ind:ind + 8])[0], ind + 8
+        val, ind = s_uint64.unpack_from(a, ind)[0], ind + 8
         val = datetime.fromtimestamp(val, timezone.utc)
     elif num == 18:
-        val, ind = struct.unpack('<q', a[ind:ind + 8])[0], ind + 8
+        val, ind = s_int64.unpack_from(a, ind)[0], ind + 8
     else:
         assert 0 == 1
-    print('aa', val, 'aa')
-    print()
     return {name: val}, ind
 
 
 def read_doc(a: bytes, ind: int = 0) -> tuple[Any, int]:
-    _, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 4
+    _, ind = s_int32.unpack_from(a, ind)[0], ind + 4
     r = {}
     while a[ind].to_bytes() != b'\x00':
         q, ind = read(a, ind)
@@ -101,39 +100,35 @@ def my_is_int32(n):
 
 
 def to_document(a: dict[str, Any]) -> bytes:
-    r = b''
-    for name, val in sorted(a.items()):
-        r += to_elem(name, val)
-    return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
+    r = b''.join(to_elem(name, val) for name, val in sorted(a.items()))
+    return s_int32.pack((len(r) + 5)) + r + b'\x00'
 
 
 def to_list(a: dict[str, Any]) -> bytes:
-    r = b''
-    for name, val in a.items():
-        r += to_elem(name, val)
-    return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
+    r = b''.join(to_elem(name, val) for name, val in a.items())
+    return s_int32.pack((len(r) + 5)) + r + b'\x00'
 
 
 def to_elem(name: str, a: Any) -> bytes:
     if type(a) is float:
         my_type = 1
-        r = struct.pack('<d', a)
+        r = s_double.pack(a)
     elif type(a) is int:
         if my_is_int32(a):
             my_type = 16
-            r = struct.pack('<i', a)
+            r = s_int32.pack(a)
         else:
             my_type = 18
-            r = struct.pack('<q', a)
+            r = s_int64.pack(a)
     elif type(a) is bool:
         my_type = 8
         r = int(a).to_bytes()
     elif type(a) is datetime:
         my_type = 9
-        r = struct.pack('<q', int(a.timestamp() * 1000))
+        r = s_int64.pack(int(a.timestamp() * 1000))
     elif type(a) is bytearray or type(a) is bytes:
         my_type = 5
-        r = struct.pack('<i', len(a)) + b'\x00' + bytes(a)
+        r = s_int32.pack(len(a)) + b'\x00' + bytes(a)
     elif type(a) is dict:
         my_type = 3
         r = to_document(a)
@@ -146,7 +141,7 @@ def to_elem(name: str, a: Any) -> bytes:
     elif type(a) is str:
         my_type = 2
         en_a = a.encode(encoding='utf-8')
-        r = struct.pack('<i', len(en_a) + 1) + en_a + b'\x00'
+        r = s_int32.pack(len(en_a) + 1) + en_a + b'\x00'
     else:
         my_type = 10
         r = b''
@@ -5,6 +5,11 @@ from datetime import datetime, timezone
 
 PROMPT = '>>> '
 
+s_int32 = struct.Struct('<i')
+s_int64 = struct.Struct('<q')
+s_uint64 = struct.Struct('<Q')
+s_double = struct.Struct('<d')
+
 
 def run_calc(context: dict[str, Any] | None = None) -> None:
     """Run interactive calculator session in specified namespace"""
@@ -107,14 +112,12 @@ def unmarshal(data: bytes) -> dict[str, Any]:
 
 
 def read_cs_string(a: bytes, ind: int) -> tuple[str, int]:
-    d = 0
-    while a[ind + d] != 0:
-        d += 1
-    return a[ind:ind + d].decode(encoding='utf-8'), ind + d + 1
+    end = a.index(0, ind)
+    return a[ind:end].decode(encoding='utf-8'), end + 1
 
 
 def read_string(a: bytes, ind: int) -> tuple[str, int]:
-    dl, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 4
+    dl, ind = s_int32.unpack_from(a, ind)[0], ind + 4
     return a[ind:ind + dl - 1].decode(encoding='utf-8'), ind + dl
 
 
@@ -123,7 +126,7 @@ def read(a: bytes, ind: int) -> tuple[Any, int]:
     name, ind = read_cs_string(a, ind + 1)
 
     if num == 1:
-        val = struct.unpack('<d', a[ind:ind + 8])[0]
+        val = s_double.unpack_from(a, ind)[0]
         ind += 8
     elif num == 2:
         val, ind = read_string(a, ind)
@@ -131,14 +134,15 @@ def read(a: bytes, ind: int) -> tuple[Any, int]:
         val, ind = read_doc(a, ind)
     elif num == 4:
         dc, ind = read_doc(a, ind)
-        if dc.keys():
-            val = [0] * (max(map(int, dc.keys())) + 1)
-            for i, j in dc.items():
-                val[int(i)] = j
+        if dc:
+            pairs = [(int(i), j) for i, j in dc.items()]
+            val = [0] * (max(p[0] for p in pairs) + 1)
+            for i, j in pairs:
+                val[i] = j
         else:
             val = []
     elif num == 5:
-        col, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 5
+        col, ind = s_int32.unpack_from(a, ind)[0], ind + 5
         val, ind = a[ind:ind + col], ind + col
     elif num == 6:
         val, ind = None, ind + 1
@@ -147,35 +151,33 @@ def read(a: bytes, ind: int) -> tuple[Any, int]:
     elif num == 8:
         val, ind = bool(a[ind]), ind + 1
     elif num == 9:
-        val, ind = struct.unpack('<q', a[ind:ind + 8])[0], ind + 8
+        val, ind = s_int64.unpack_from(a, ind)[0], ind + 8
         val = datetime.fromtimestamp(val / 1000.0, tz=timezone.utc)
     elif num == 10:
         val, ind = None, ind
     elif num == 16:
-        val, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 4
+        val, ind = s_int32.unpack_from(a, ind)[0], ind + 4
     elif num == 17:
-        val, ind = struct.unpack('<Q', a[ind:ind + 8])[0], ind + 8
+        val, ind = s_uint64.unpack_from(a, ind)[0], ind + 8
         val = datetime.fromtimestamp(val, timezone.utc)
     elif num == 18:
-        val, ind = struct.unpack('<q', a[ind:ind + 8])[0], ind + 8
+        val, ind = s_int64.unpack_from(a, ind)[0], ind + 8
     else:
         assert 0 == 1
     return {name: val}, ind
 
 
 def read_doc(a: bytes, ind: int = 0) -> tuple[Any, int]:
-    _, ind = struct.unpack('<i', a[ind:ind + 4])[0], ind + 4
+    _, ind = s_int32.unpack_from(a, ind)[0], ind + 4
     r = {}
     while a[ind].to_bytes() != b'\x00':
         q, ind = read(a, ind)
         r.update(q)
     return r, ind + 1
 
-vis = []
-
 def marshal(data: dict[str, Any]) -> bytes:
     if type(data) is dict:
-        return to_document(data)
+        return to_document(data, set())
     else:
         raise BsonUnsupportedObjectError
 
@@ -204,74 +206,76 @@ def cor_document(a: dict[str, Any]) -> None:
         if not (type(val) in my_types or val is None):
             raise BsonUnsupportedObjectError
 
-def to_document(a: dict[str, Any]) -> bytes:
+def to_document(a: dict[str, Any], vis: set[int]) -> bytes:
     cor_document(a)
-    r = b''
     if id(a) in vis:
         raise BsonCycleDetectedError
     else:
-        vis.append(id(a))
+        vis.add(id(a))
 
+    parts = []
+    total = 0
     for name, val in sorted(a.items()):
-        r += to_elem(name, val)
-        if not my_is_int32(len(r)):
+        e = to_elem(name, val, vis)
+        parts.append(e)
+        total += len(e)
+        if not my_is_int32(total):
             raise BsonDocumentTooBigError
+    r = b''.join(parts)
 
     vis.remove(id(a))
-    return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
+    return s_int32.pack((len(r) + 5)) + r + b'\x00'
 
 
-def to_list(a: dict[str, Any]) -> bytes:
-    r = b''
-    for name, val in a.items():
-        r += to_elem(name, val)
-    return struct.pack('<i', (len(r) + 5)) + r + b'\x00'
+def to_list(a: dict[str, Any], vis: set[int]) -> bytes:
+    r = b''.join(to_elem(name, val, vis) for name, val in a.items())
+    return s_int32.pack((len(r) + 5)) + r + b'\x00'
 
 
 
 
-def to_elem(name: str, a: Any) -> bytes:
+def to_elem(name: str, a: Any, vis: set[int]) -> bytes:
     if type(a) is float:
         my_type = 1
-        r = struct.pack('<d', a)
+        r = s_double.pack(a)
     elif type(a) is int:
         if my_is_int32(a):
             my_type = 16
-            r = struct.pack('<i', a)
+            r = s_int32.pack(a)
         else:
             my_type = 18
-            r = struct.pack('<q', a)
+            r = s_int64.pack(a)
     elif type(a) is bool:
         my_type = 8
         r = int(a).to_bytes()
     elif type(a) is datetime:
         my_type = 9
-        r = struct.pack('<q', int(a.timestamp() * 1000))
+        r = s_int64.pack(int(a.timestamp() * 1000))
     elif type(a) is bytearray or type(a) is bytes:
         my_type = 5
         if not my_is_int32(len(a)):
             raise BsonBinaryTooBigError
-        r = struct.pack('<i', len(a)) + b'\x00' + bytes(a)
+        r = s_int32.pack(len(a)) + b'\x00' + bytes(a)
     elif type(a) is dict:
         my_type = 3
-        r = to_document(a)
+        r = to_document(a, vis)
     elif type(a) is list or type(a) is tuple:
         if id(a) in vis:
             raise BsonCycleDetectedError
         else:
-            vis.append(id(a))
+            vis.add(id(a))
         my_type = 4
         dc = {}
         for i in range(len(a)):
             dc[str(i)] = a[i]
-        r = to_list(dc)
+        r = to_list(dc, vis)
         vis.remove(id(a))
     elif type(a) is str:
         my_type = 2
         en_a = a.encode(encoding='utf-8')
         if not my_is_int32(len(en_a)):
             raise BsonStringTooBigError
-        r = struct.pack('<i', len(en_a) + 1) + en_a + b'\x00'
+        r = s_int32.pack(len(en_a) + 1) + en_a + b'\x00'
     elif a is None:
         my_type = 10
         r = b''
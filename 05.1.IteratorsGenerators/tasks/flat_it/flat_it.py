@@ -7,10 +7,19 @@ def flat_it(sequence: Iterable[Any]) -> Iterator[Any]:
     :param sequence: iterable with arbitrary level of nested iterables
     :return: generator producing flatten sequence
     """
-    for i in sequence:
+    stack = [iter(sequence)]
+    while stack:
         try:
-            if type(i) is str and len(i)==1:
-                raise TypeError
-            yield from (e for e in flat_it(i))
-        except TypeError:
+            i = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+        if isinstance(i, str):
+            if len(i) == 1:
+                yield i
+            elif i:
+                stack.append(iter(i))
+        elif isinstance(i, Iterable):
+            stack.append(iter(i))
+        else:
             yield i
@@ -4,32 +4,30 @@ from collections.abc import Iterable, Iterator, Sized
 class RangeIterator(Iterator[int]):
     """The iterator class for Range"""
 
+    __slots__ = ('ind', 'step', 'stop', 'sign')
+
     def __init__(self, range_: 'Range') -> None:
-        self.ind = range_.start - range_.step
+        self.ind = range_.start
         self.step = range_.step
         self.stop = range_.stop
+        self.sign = 1 if range_.step > 0 else -1
 
     def __iter__(self) -> 'RangeIterator':
         return self
 
     def __next__(self) -> int:
-        if self.step > 0:
-            if self.ind + self.step < self.stop:
-                self.ind += self.step
-                return self.ind
-            else:
-                raise StopIteration
-        else:
-            if self.ind + self.step > self.stop:
-                self.ind += self.step
-                return self.ind
-            else:
-                raise StopIteration
+        v = self.ind
+        if (v - self.stop) * self.sign >= 0:
+            raise StopIteration
+        self.ind = v + self.step
+        return v
 
 
 class Range(Sized, Iterable[int]):
     """The range-like type, which represents an immutable sequence of numbers"""
 
+    __slots__ = ('start', 'stop', 'step', '_len')
+
     def __init__(self, *args: int) -> None:
         """
         :param args: either it's a single `stop` argument
@@ -48,7 +46,11 @@ class Range(Sized, Iterable[int]):
                 self.step = 1
             except ValueError:
                 self.start, self.stop, self.step = 0, int(args[0]), 1
-        self.iter = RangeIterator(self)
+        d = self.stop - self.start
+        if (d > 0) == (self.step > 0):
+            self._len = (abs(d) - 1) // abs(self.step) + 1
+        else:
+            self._len = 0
 
     def __iter__(self) -> 'RangeIterator':
         return RangeIterator(self)
@@ -63,16 +65,20 @@ class Range(Sized, Iterable[int]):
         return self.__repr__()
 
     def __contains__(self, key: int) -> bool:
-        return ((self.start <= key < self.stop and key % self.step == self.start % self.step and self.step > 0) or
-                (self.start >= key > self.stop and key % self.step == self.start % self.step and self.step < 0))
+        step = self.step
+        if (key - self.start) % step != 0:
+            return False
+        if step > 0:
+            return self.start <= key < self.stop
+        return self.start >= key > self.stop
 
     def __getitem__(self, key: int) -> int:
+        n = self._len
         if key < 0:
-            key = len(self) + key
-
-        if key < 0 or key >= len(self):
-            raise IndexError("range object index out of range")
-        return self.start + key * self.step
+            key += n
+        if 0 <= key < n:
+            return self.start + key * self.step
+        raise IndexError("range object index out of range")
 
     def __len__(self) -> int:
-        return max((self.stop - self.start) // self.step + bool((self.stop - self.start) % self.step),0)
+        return self._len
@@ -1,11 +1,13 @@
-from queue import Queue
+from collections import deque
 from abc import ABC, abstractmethod
-from typing import Generator, Any
+from typing import Generator, Any, cast
 
 
 class SystemCall(ABC):
     """SystemCall yielded by Task to handle with Scheduler"""
 
+    __slots__ = ()
+
     @abstractmethod
     def handle(self, scheduler: 'Scheduler', task: 'Task') -> bool:
         """
@@ -19,6 +21,8 @@ Coroutine = Generator[SystemCall | None, Any, None]
 
 
 class Task:
+    __slots__ = ('task_id', 'target', 'last_res', 'is_work')
+
     def __init__(self, task_id: int, target: Coroutine) -> None:
         """
         :param task_id: id of the task
@@ -53,16 +57,17 @@ class Scheduler:
 
     def __init__(self) -> None:
         self.task_id = 1
-        self.task_queue: Queue[Task] = Queue()
+        self.task_queue: deque[Task] = deque()
         self.task_map: dict[int, Task] = {}  # task_id -> task
-        self.wait_map: dict[int, list[Task]] = {}  # task_id -> list of waiting tasks
+        self.wait_count: dict[int, int] = {}  # task_id -> number of tasks it still waits for
+        self.waiters_of: dict[int, list[int]] = {}  # task_id -> ids of tasks waiting for it
 
     def _schedule_task(self, task: Task) -> None:
         """
         Add task into task queue
         :param task: task to schedule for execution
         """
-        self.task_queue.put(task)
+        self.task_queue.append(task)
 
     def new(self, target: Coroutine) -> int:
         """
@@ -86,6 +91,12 @@ class Scheduler:
         if task_id in self.task_map:
             self.task_map[task_id].target.close()
             del self.task_map[task_id]
+            for waiter in self.waiters_of.pop(task_id, ()):
+                self.wait_count[waiter] -= 1
+                if self.wait_count[waiter] == 0:
+                    del self.wait_count[waiter]
+                    if waiter in self.task_map:
+                        self._schedule_task(self.task_map[waiter])
             return True
         return False
 
@@ -97,9 +108,8 @@ class Scheduler:
         :return: true if task and wait ids are valid task ids
         """
         if task_id in self.task_map and wait_id in self.task_map:
-            if task_id not in  self.wait_map:
-                self.wait_map[task_id] = []
-            self.wait_map[task_id].append(self.task_map[wait_id])
+            self.wait_count[task_id] = self.wait_count.get(task_id, 0) + 1
+            self.waiters_of.setdefault(wait_id, []).append(task_id)
             return True
         return False
 
@@ -112,41 +122,31 @@ class Scheduler:
         if ticks is None:
             ticks = 1000
 
+        task_queue = self.task_queue
+        task_map = self.task_map
+        schedule_task = self._schedule_task
+        exit_task = self.exit_task
+
         for ind in range(ticks):
-            if self.task_queue.empty():
+            if not task_queue:
                 return
-            task = self.task_queue.get()
+            task = task_queue.popleft()
 
-            while task.task_id not in self.task_map:
-                if self.task_queue.empty():
+            while task.task_id not in task_map:
+                if not task_queue:
                     return
-                task = self.task_queue.get()
-
-            if task.task_id in self.wait_map:
-                fl = True
-                for i in self.wait_map[task.task_id]:
-                    if i.task_id in self.task_map:
-                        fl = False
-                        break
-                if not fl:
-                    self._schedule_task(task)
-                    continue
+                task = task_queue.popleft()
 
             tmp = task.step()
 
-            if type(tmp) is GetTid:
-                task.set_syscall_result(task.task_id)
-            elif type(tmp) is NewTask:
-                task.set_syscall_result(self.new(tmp.target))
-            elif type(tmp) is KillTask:
-                task.set_syscall_result(self.exit_task(tmp.task_id))
-            elif type(tmp) is WaitTask:
-                task.set_syscall_result(self.wait_task(task.task_id, tmp.task_id))
+            reschedule = True
+            if tmp is not None:
+                reschedule = tmp.handle(self, task)
 
-            if task.is_work:
-                self._schedule_task(task)
-            else:
-                self.exit_task(task.task_id)
+            if not task.is_work:
+                exit_task(task.task_id)
+            elif reschedule:
+                schedule_task(task)
 
 
 
@@ -158,37 +158,59 @@ class Scheduler:
 class GetTid(SystemCall):
     """System call to get current task id"""
 
+    __slots__ = ()
+
+    _instance: 'GetTid | None' = None
+
+    def __new__(cls) -> 'GetTid':
+        instance = cls._instance
+        if instance is None:
+            instance = cast('GetTid', super().__new__(cls))
+            cls._instance = instance
+        return instance
+
     def handle(self, scheduler: Scheduler, task: Task) -> bool:
-        pass
+        task.set_syscall_result(task.task_id)
+        return True
 
 
 class NewTask(SystemCall):
     """System call to create new task from target coroutine"""
 
+    __slots__ = ('target',)
+
     def __init__(self, target: Coroutine) -> None:
         self.target = target
 
     def handle(self, scheduler: Scheduler, task: Task) -> bool:
-        pass
+        task.set_syscall_result(scheduler.new(self.target))
+        return True
 
 
 class KillTask(SystemCall):
     """System call to kill task with particular task id"""
 
+    __slots__ = ('task_id',)
+
     def __init__(self, task_id: int) -> None:
         self.task_id = task_id
 
     def handle(self, scheduler: Scheduler, task: Task) -> bool:
-        pass
+        task.set_syscall_result(scheduler.exit_task(self.task_id))
+        return True
 
 
 class WaitTask(SystemCall):
     """System call to wait task with particular task id"""
 
+    __slots__ = ('task_id',)
+
     def __init__(self, task_id: int) -> None:
         self.task_id = task_id
 
     def handle(self, scheduler: Scheduler, task: Task) -> bool:
         # Note: One shouldn't reschedule task which is waiting for another one.
         # But one must reschedule task if task id to wait for is invalid.
-        pass
+        ok = scheduler.wait_task(task.task_id, self.task_id)
+        task.set_syscall_result(ok)
+        return not ok
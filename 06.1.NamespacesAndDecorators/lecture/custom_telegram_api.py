@@ -1,4 +1,3 @@
-import json
 import requests
 import time
 import sys
@@ -15,6 +14,8 @@ LINK = "https://api.telegram.org/bot" + BOT_SECRET + "/sendMessage"
 
 MAX_SENDING_ATTEMPTS = 5
 
+_SESSION = requests.Session()
+
 def send(message="Sample text."):
     message_data = {"chat_id": CHAT_ID, "text": message}
 
@@ -22,8 +23,8 @@ def send(message="Sample text."):
     attempts = 0
     while not is_sended and attempts < MAX_SENDING_ATTEMPTS:
         try:
-            r1 = requests.get(LINK, params=message_data)
-            is_sended = json.loads(r1.text)["ok"]
+            r1 = _SESSION.get(LINK, params=message_data, timeout=5)
+            is_sended = r1.json()["ok"]
         except Exception:
             pass
         if not is_sended:
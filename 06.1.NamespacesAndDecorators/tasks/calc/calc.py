@@ -1,4 +1,5 @@
 import builtins
+import functools
 import sys
 import math
 from typing import Any
@@ -6,6 +7,11 @@ from typing import Any
 PROMPT = '>>> '
 
 
+@functools.lru_cache(maxsize=256)
+def _compile(src: str) -> Any:
+    return compile(src, '<calc>', 'eval')
+
+
 def run_calc(context: dict[str, Any] | None = None) -> None:
     """Run interactive calculator session in specified namespace"""
     inp = sys.stdin
@@ -19,7 +25,7 @@ def run_calc(context: dict[str, Any] | None = None) -> None:
         if not q:
             out.write('>>> \n')
             return
-        out.write('>>> ' + str(builtins.eval(q, context)) + "\n")
+        out.write('>>> ' + str(builtins.eval(_compile(q.rstrip()), context)) + "\n")
 
 if __name__ == '__main__':
     context = {'math': math}
@@ -15,16 +15,19 @@ def cache(max_size: int) -> Callable[[Function], Function]:
     """
     def decorator(func: Function):
         tmp_res = OrderedDict()
+        miss = object()
 
         @functools.wraps(func)
         def wrapper(*args, **kwds) -> Function:
-            if args in tmp_res.keys():
-                return tmp_res[args]
-            else:
-                if len(tmp_res) == max_size:
-                    tmp_res.pop(list(tmp_res.keys())[0])
-                tmp_res[args] = func(*args, **kwds)
-                return tmp_res[args]
+            val = tmp_res.get(args, miss)
+            if val is not miss:
+                tmp_res.move_to_end(args)
+                return val
+            if len(tmp_res) == max_size:
+                tmp_res.popitem(last=False)
+            val = func(*args, **kwds)
+            tmp_res[args] = val
+            return val
 
         return cast(Function, wrapper)
 
@@ -1,5 +1,5 @@
 import functools
-import datetime
+import time
 
 def profiler(func):  # type: ignore
     """
@@ -16,13 +16,13 @@ def profiler(func):  # type: ignore
         if type(wrapper.calls) is int:
             fl = True
             wrapper.calls = 0.0
+            start_time = time.perf_counter_ns()
 
-        start_time = datetime.datetime.now()
         result = func(*args, **kwargs)
         wrapper.calls += 1.0
 
         if fl:
-            wrapper.last_time_taken = (datetime.datetime.now() - start_time).total_seconds()
+            wrapper.last_time_taken = (time.perf_counter_ns() - start_time) / 1e9
             wrapper.calls = int(wrapper.calls)
         return result
 
@@ -1,44 +1,46 @@
+import numpy as np
+import numpy.typing as npt
+
+
+def _count_neighbors(board: np.ndarray) -> tuple[npt.NDArray[np.int8], npt.NDArray[np.int8]]:
+    n, m = board.shape
+    p2 = np.pad((board == 2).view(np.int8), 1)
+    p3 = np.pad((board == 3).view(np.int8), 1)
+    n2: npt.NDArray[np.int8] = np.zeros((n, m), dtype=np.dtype(np.int8))
+    n3: npt.NDArray[np.int8] = np.zeros((n, m), dtype=np.dtype(np.int8))
+    for di in (0, 1, 2):
+        for dj in (0, 1, 2):
+            if di == 1 and dj == 1:
+                continue
+            n2 += p2[di:di + n, dj:dj + m]
+            n3 += p3[di:di + n, dj:dj + m]
+    return n2, n3
+
+
+def _step(board: np.ndarray) -> np.ndarray:
+    n2, n3 = _count_neighbors(board)
+    new_board = board.copy()
+    empty = board == 0
+    new_board[empty & (n2 == 3)] = 2
+    new_board[empty & (n2 != 3) & (n3 == 3)] = 3
+    new_board[(board == 2) & ((n2 <= 1) | (n2 >= 4))] = 0
+    new_board[(board == 3) & ((n3 <= 1) | (n3 >= 4))] = 0
+    return new_board
+
+
 class LifeGame(object):
     """
     Class for Game life
     """
 
     def __init__(self, board: list[list[int]]):
-        self.board = board
         self.n = len(board)
         self.m = 0 if self.n == 0 else len(board[0])
+        self.board = np.asarray(board, dtype=np.int8).reshape(self.n, self.m)
 
-    def _col_neighbors(self, x: int, y: int, type_n: int) -> int:
-        sd = [(i, j) for i in range(-1, 2) for j in range(-1, 2)]
-        sd.remove((0,0))
-        r = 0
-        for si, sj in sd:
-            i = x + si
-            j = y + sj
-            if 0 <= i < self.n and 0 <= j < self.m:
-                if self.board[i][j] == type_n:
-                    r += 1
-        return r
-
-    def _update_cl(self, x: int, y: int) -> int:
-        if self.board[x][y] == 0:
-            if self._col_neighbors(x, y, 2) == 3:
-                return 2
-            elif self._col_neighbors(x, y, 3) == 3:
-                return 3
-        elif (self.board[x][y] == 2 and
-              (self._col_neighbors(x, y, 2) <= 1 or self._col_neighbors(x, y, 2) >= 4)):
-            return 0
-        elif (self.board[x][y] == 3 and
-              (self._col_neighbors(x, y, 3) <= 1 or self._col_neighbors(x, y, 3) >= 4)):
-            return 0
-        return self.board[x][y]
+    def _update_board(self) -> None:
+        self.board = _step(self.board)
 
     def get_next_generation(self):
-        new_board = [[0] * self.m for i in range(self.n)]
-        for i in range(self.n):
-            for j in range(self.m):
-                new_board[i][j] = self._update_cl(i,j)
-        self.board = new_board
-        return self.board
-
+        self._update_board()
+        return self.board.tolist()
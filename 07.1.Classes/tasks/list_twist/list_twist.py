@@ -15,29 +15,43 @@ class ListTwist(UserList[tp.Any]):
                      If size greater than list length - pad with Nones
     """
 
+    def _set_size(self, value):
+        current_size = len(self.data)
+        if value > current_size:
+            self.data.extend([None] * (value - current_size))
+        elif value < current_size:
+            del self.data[value:]
+
+    _GETTERS = {
+        'reversed': lambda data: data[::-1],
+        'R': lambda data: data[::-1],
+        'first': lambda data: data[0],
+        'F': lambda data: data[0],
+        'last': lambda data: data[-1],
+        'L': lambda data: data[-1],
+        'size': len,
+        'S': len,
+    }
+
+    _SETTERS = {
+        'first': lambda self, value: self.data.__setitem__(0, value),
+        'F': lambda self, value: self.data.__setitem__(0, value),
+        'last': lambda self, value: self.data.__setitem__(-1, value),
+        'L': lambda self, value: self.data.__setitem__(-1, value),
+        'size': _set_size,
+        'S': _set_size,
+    }
+
     def __getattr__(self, name):
-        if name in ('reversed', 'R'):
-            return self.data[::-1]
-        elif name in ('first', 'F'):
-            return self.data[0]
-        elif name in ('last', 'L'):
-            return self.data[-1]
-        elif name in ('size', 'S'):
-            return len(self.data)
-        else:
-            return super().__getattr__(name)
+        getter = ListTwist._GETTERS.get(name)
+        if getter is not None:
+            return getter(self.data)
+        raise AttributeError(name)
 
     def __setattr__(self, name, value):
-        if name in ('first', 'F'):
-            self.data[0] = value
-        elif name in ('last', 'L'):
-            self.data[-1] = value
-        elif name in ('size', 'S'):
-            current_size = len(self.data)
-            if value > current_size:
-                self.data.extend([None] * (value - current_size))
-            elif value < current_size:
-                del self.data[value:]
+        setter = ListTwist._SETTERS.get(name)
+        if setter is not None:
+            setter(self, value)
         else:
             super().__setattr__(name, value)
 
@@ -56,9 +56,7 @@ class Order:
     have_promo: InitVar[bool] = field(init=True, default=False)
 
     def __post_init__(self, have_promo: bool):
-        tmp = 0.0
-        for i in self.positions:
-            tmp += i.cost
+        tmp = float(sum([i.cost for i in self.positions]))
         if have_promo:
             tmp *= (1 - DISCOUNT_PERCENTS / 100)
         self.cost = int(tmp)
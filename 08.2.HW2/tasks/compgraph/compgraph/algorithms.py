@@ -1,4 +1,3 @@
-import copy
 from compgraph import operations
 from compgraph.graph import Graph
 
@@ -6,9 +5,7 @@ from compgraph.graph import Graph
 def word_count_graph(input_stream_name: str, text_column: str = 'text', count_column: str = 'count') -> Graph:
     """Constructs graph which counts words in text_column of all rows passed"""
     return Graph.graph_from_iter(input_stream_name) \
-        .map(operations.FilterPunctuation(text_column)) \
-        .map(operations.LowerCase(text_column)) \
-        .map(operations.Split(text_column)) \
+        .map(operations.TokenizeNormalize(text_column)) \
         .sort([text_column]) \
         .reduce(operations.Count(count_column), [text_column]) \
         .sort([count_column, text_column])
@@ -22,25 +19,20 @@ def inverted_index_graph(input_stream_name: str, doc_column: str = 'doc_id', tex
     freq_word_column = 'freq_word'
 
     words_graph: Graph = Graph.graph_from_iter(input_stream_name) \
-        .map(operations.FilterPunctuation(text_column)) \
-        .map(operations.LowerCase(text_column)) \
-        .map(operations.Split(text_column))
+        .map(operations.TokenizeNormalize(text_column))
 
     len_document_graph: Graph = Graph.graph_from_iter(input_stream_name) \
-        .sort([doc_column]) \
         .reduce(operations.CountRow(len_document_column), [])
 
-    col_doc_whith_word_graph: Graph = copy.deepcopy(words_graph) \
-        .sort([text_column, doc_column]) \
-        .reduce(operations.FirstReducer(), [text_column, doc_column]) \
-        .reduce(operations.Count(col_doc_with_word_column), [text_column])
+    col_doc_whith_word_graph: Graph = words_graph.clone() \
+        .hash_reduce(operations.FirstReducer(), [text_column, doc_column]) \
+        .hash_reduce(operations.Count(col_doc_with_word_column), [text_column])
 
-    result_graph: Graph = copy.deepcopy(words_graph) \
+    result_graph: Graph = words_graph.clone() \
         .sort([doc_column, text_column]) \
         .reduce(operations.TermFrequency(text_column, freq_word_column), [doc_column]) \
-        .sort([text_column]) \
-        .join(operations.InnerJoiner(), copy.deepcopy(col_doc_whith_word_graph), [text_column]) \
-        .join(operations.InnerJoiner(), copy.deepcopy(len_document_graph), []) \
+        .hash_join(operations.InnerJoiner(), col_doc_whith_word_graph.clone(), [text_column]) \
+        .hash_join(operations.InnerJoiner(), len_document_graph.clone(), []) \
         .sort([text_column, doc_column]) \
         .reduce(operations.Tf_idf(freq_word_column, len_document_column, col_doc_with_word_column, result_column),
                 [text_column, doc_column]) \
@@ -58,28 +50,22 @@ def pmi_graph(input_stream_name: str, doc_column: str = 'doc_id', text_column: s
     count_word_column = 'count_word'
 
     words_graph: Graph = Graph.graph_from_iter(input_stream_name) \
-        .map(operations.FilterPunctuation(text_column)) \
-        .map(operations.LowerCase(text_column)) \
-        .map(operations.Split(text_column)) \
+        .map(operations.TokenizeNormalize(text_column))
 
-    filter_graph: Graph = copy.deepcopy(words_graph) \
-        .sort([text_column, doc_column]) \
-        .reduce(operations.Count(count_word_column), [text_column, doc_column])
+    filter_graph: Graph = words_graph.clone() \
+        .hash_reduce(operations.Count(count_word_column), [text_column, doc_column])
 
     words_graph = words_graph \
-        .sort([text_column, doc_column]) \
-        .join(operations.InnerJoiner(), copy.deepcopy(filter_graph), [text_column, doc_column]) \
+        .hash_join(operations.InnerJoiner(), filter_graph.clone(), [text_column, doc_column]) \
         .map(operations.Filter(lambda row: (len(row[text_column]) > 4) and row[count_word_column] >= 2))
 
-    all_freq_graph = copy.deepcopy(words_graph) \
-        .sort([text_column]) \
+    all_freq_graph = words_graph.clone() \
         .reduce(operations.TermFrequency(text_column, freq_word_all_column), []) \
 
-    result_graph: Graph = copy.deepcopy(words_graph) \
+    result_graph: Graph = words_graph.clone() \
         .sort([doc_column, text_column]) \
         .reduce(operations.TermFrequency(text_column, freq_word_column), [doc_column]) \
-        .sort([text_column]) \
-        .join(operations.InnerJoiner(), copy.deepcopy(all_freq_graph), [text_column]) \
+        .hash_join(operations.InnerJoiner(), all_freq_graph.clone(), [text_column]) \
         .sort([text_column, doc_column]) \
         .reduce(operations.Pmi(freq_word_column, freq_word_all_column, result_column), [text_column, doc_column]) \
         .sort([doc_column]) \
@@ -99,14 +85,12 @@ def yandex_maps_graph(input_stream_name_time: str, input_stream_name_length: str
     dist_column = 'dist'
 
     dist_graph = Graph.graph_from_iter(input_stream_name_length) \
-        .sort([edge_id_column]) \
         .map(operations.CalculateDistance(start_coord_column, end_coord_column, dist_column))
 
     result_graph = Graph.graph_from_iter(input_stream_name_time) \
-        .sort([edge_id_column]) \
         .map(operations.CalculateTime(enter_time_column, leave_time_column,
                                       weekday_result_column, hour_result_column, time_second_column)) \
-        .join(operations.InnerJoiner(), copy.deepcopy(dist_graph), [edge_id_column]) \
+        .hash_join(operations.InnerJoiner(), dist_graph.clone(), [edge_id_column]) \
         .map(operations.CalculateSpeed(dist_column, time_second_column, speed_result_column)) \
         .sort([weekday_result_column, hour_result_column]) \
         .reduce(operations.Mean(speed_result_column), [weekday_result_column, hour_result_column])
@@ -3,6 +3,11 @@ from pathlib import Path
 
 import click
 
+try:
+    import orjson  # much faster drop-in replacement, optional
+except ImportError:
+    orjson = None  # type: ignore
+
 from compgraph import operations, plot_image
 from compgraph.algorithms import (
     word_count_graph,
@@ -22,16 +27,20 @@ def cli() -> None:
 
 def _read_data(input_file: Path) -> operations.TRowsIterable:
     """Read data from file line by line as JSON"""
-    with open(input_file, 'r') as f:
+    loads = json.loads if orjson is None else orjson.loads
+    with open(input_file, 'rb', buffering=1 << 20) as f:
         for line in f:
             if line.strip():
-                yield json.loads(line)
+                yield loads(line)
 
 
 def _write_data(rows: operations.TRowsIterable, file_name: Path) -> None:
-    with open(file_name, 'w') as f:
-        for row in rows:
-            f.write(json.dumps(row, ensure_ascii=False) + '\n')
+    if orjson is not None:
+        with open(file_name, 'wb', buffering=1 << 20) as bf:
+            bf.writelines(orjson.dumps(row) + b'\n' for row in rows)
+        return
+    with open(file_name, 'w', buffering=1 << 20) as f:
+        f.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
 
 
 @cli.command()
@@ -41,9 +50,7 @@ def word_count(input_file: Path, output_file: Path) -> None:
     """Word_count cli"""
     graph: Graph = word_count_graph(input_stream_name='docs')
 
-    tmp = list(_read_data(input_file))
-    data: operations.TRowsIterable = iter(tmp)
-    result: operations.TRowsIterable = graph.run(docs=lambda: data)
+    result: operations.TRowsIterable = graph.run(docs=lambda: _read_data(input_file))
     _write_data(result, output_file)
 
     click.echo("Word count completed")
@@ -56,8 +63,7 @@ def inverted_index(input_file: Path, output_file: Path) -> None:
     """Inverted index cli"""
     graph: Graph = inverted_index_graph(input_stream_name='text')
 
-    data: list[operations.TRow] = list(_read_data(input_file))
-    result: operations.TRowsIterable = graph.run(text=lambda: iter(data))
+    result: operations.TRowsIterable = graph.run(text=lambda: _read_data(input_file))
     _write_data(result, output_file)
 
     click.echo("Inverted index completed")
@@ -70,8 +76,7 @@ def pmi(input_file: Path, output_file: Path) -> None:
     """Calculate PMI cli"""
     graph: Graph = pmi_graph(input_stream_name='text')
 
-    data: list[operations.TRow] = list(_read_data(input_file))
-    result: operations.TRowsIterable = graph.run(text=lambda: iter(data))
+    result: operations.TRowsIterable = graph.run(text=lambda: _read_data(input_file))
     _write_data(result, output_file)
 
     click.echo("Calculate PMI completed")
@@ -95,12 +100,9 @@ def yandex_maps(travel_times_file: Path, road_graph_file: Path,
         weekday_result_column='weekday', hour_result_column='hour', speed_result_column='speed'
     )
 
-    travel_data: list[operations.TRow] = list(_read_data(travel_times_file))
-    road_data: list[operations.TRow] = list(_read_data(road_graph_file))
-
     result: operations.TRowsIterable = graph.run(
-        travel_time=lambda: iter(travel_data),
-        edge_length=lambda: iter(road_data)
+        travel_time=lambda: _read_data(travel_times_file),
+        edge_length=lambda: _read_data(road_graph_file)
     )
     tmp = list(result)
     if plot:
@@ -2,7 +2,31 @@ import typing as tp
 from multiprocessing import Pipe, Process, connection
 from operator import itemgetter
 
-from compgraph.operations import Operation, TRowsIterable, TRowsGenerator
+try:
+    import numpy as np  # C-level sort over key columns, optional
+except ImportError:
+    np = None  # type: ignore
+
+from compgraph.operations import Operation, TRow, TRowsIterable, TRowsGenerator
+
+
+def _argsort_rows(rows: list[TRow], keys: tp.Sequence[str]) -> tp.Any:
+    """Stable order of rows by key columns via numpy lexsort
+    Returns None when numpy is missing or a key column is not uniformly typed
+    """
+    if np is None:
+        return None
+    columns: list[np.ndarray] = []
+    for key in keys:
+        try:
+            column = np.asarray([row[key] for row in rows])
+        except (TypeError, ValueError, OverflowError):
+            return None
+        if column.dtype == object:
+            return None
+        columns.append(column)
+    # lexsort treats the last array as the primary key
+    return np.lexsort(columns[::-1])
 
 
 def do_sort(endpoint: connection.Connection, keys: tuple[str, ...]) -> None:
@@ -12,7 +36,11 @@ def do_sort(endpoint: connection.Connection, keys: tuple[str, ...]) -> None:
         if row is None:
             break
         rows.append(row)
-    rows.sort(key=itemgetter(*keys))
+    order = _argsort_rows(rows, keys) if rows else None
+    if order is None:
+        rows.sort(key=itemgetter(*keys))
+    else:
+        rows = [rows[i] for i in order]
     for row in rows:
         endpoint.send(row)
     endpoint.send(None)
@@ -27,6 +55,7 @@ class ExternalSort(Operation):
 
     def __init__(self, keys: tp.Sequence[str]):
         self.keys = keys
+        self.output_sorted_by = tuple(keys)
 
     def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
         local_endpoint, remote_endpoint = Pipe()
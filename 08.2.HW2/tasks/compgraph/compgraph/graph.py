@@ -1,7 +1,9 @@
 import typing as tp
+from concurrent.futures import ThreadPoolExecutor, Future
 
 from compgraph.operations import Operation, Mapper, Joiner, Reducer, TRowsIterable, TRow
-from compgraph.operations import Map, Join, Reduce, ReadIterFactory, Read
+from compgraph.operations import Map, FusedMap, Join, BroadcastHashJoin, Reduce, HashReduce, \
+    ReadIterFactory, Read
 from compgraph.external_sort import ExternalSort
 
 
@@ -13,6 +15,15 @@ class Graph:
         self.__join_graphs: dict[int, Graph] = {}
 
 
+    def clone(self) -> 'Graph':
+        """Construct new graph with the same operations, cheap to call
+        Operations are shared, which is safe since they are stateless after construction
+        """
+        graph = Graph()
+        graph.__operations = list(self.__operations)
+        graph.__join_graphs = dict(self.__join_graphs)
+        return graph
+
     @staticmethod
     def graph_from_iter(name: str) -> 'Graph':
         """Construct new graph which reads data from row iterator (in form of sequence of Rows
@@ -37,9 +48,15 @@ class Graph:
 
     def map(self, mapper: Mapper) -> 'Graph':
         """Construct new graph extended with map operation with particular mapper
+        Consecutive maps are fused into one operation
         :param mapper: mapper to use
         """
-        self.__operations.append(Map(mapper))
+        last = self.__operations[-1] if self.__operations else None
+        fused = last.fuse(mapper) if isinstance(last, (Map, FusedMap)) else None
+        if fused is not None:
+            self.__operations[-1] = fused
+        else:
+            self.__operations.append(Map(mapper))
         return self
 
     def reduce(self, reducer: Reducer, keys: tp.Sequence[str]) -> 'Graph':
@@ -50,10 +67,24 @@ class Graph:
         self.__operations.append(Reduce(reducer, keys))
         return self
 
+    def hash_reduce(self, reducer: Reducer, keys: tp.Sequence[str]) -> 'Graph':
+        """Construct new graph extended with hash reduce operation, which does not
+        require sorted input; use only with order-independent reducers
+        :param reducer: reducer to use
+        :param keys: keys for grouping
+        """
+        self.__operations.append(HashReduce(reducer, keys))
+        return self
+
     def sort(self, keys: tp.Sequence[str]) -> 'Graph':
         """Construct new graph extended with sort operation
+        Elided when the previous operation already emits rows in this order
         :param keys: sorting keys (typical is tuple of strings)
         """
+        if self.__operations:
+            sorted_by = self.__operations[-1].output_sorted_by
+            if keys and tuple(keys) == sorted_by[:len(keys)]:
+                return self
         self.__operations.append(ExternalSort(keys))
         return self
 
@@ -67,11 +98,38 @@ class Graph:
         self.__operations.append(Join(joiner, keys))
         return self
 
+    def hash_join(self, joiner: Joiner, join_graph: 'Graph', keys: tp.Sequence[str]) -> 'Graph':
+        """Construct new graph extended with hash join operation with another (small) graph
+        Unlike join, does not require either side to be sorted, but buffers join_graph in memory
+        :param joiner: join strategy to use
+        :param join_graph: other graph to join with, must fit in memory
+        :param keys: keys for grouping
+        """
+        self.__join_graphs[len(self.__operations)] = join_graph
+        self.__operations.append(BroadcastHashJoin(joiner, keys))
+        return self
+
     def run(self, **kwargs: tp.Any) -> TRowsIterable:
         """Single method to start execution; data sources passed as kwargs"""
+        futures: dict[int, Future[list[TRow]]] = {}
+        broadcast_inds = [ind for ind in self.__join_graphs
+                          if isinstance(self.__operations[ind], BroadcastHashJoin)]
+        if broadcast_inds:
+            # hash-join sides are buffered in memory by contract anyway, so
+            # they can be materialized concurrently instead of one by one on
+            # demand; merge-join sides stay lazy to keep streaming
+            executor = ThreadPoolExecutor(max_workers=len(broadcast_inds))
+            for ind in broadcast_inds:
+                futures[ind] = executor.submit(
+                    lambda graph: list(graph.run(**kwargs)), self.__join_graphs[ind])
+            executor.shutdown(wait=False)
+
         tmp_table: TRowsIterable = iter({})
         for operationInd in range(len(self.__operations)):
-            if operationInd in self.__join_graphs:
+            if operationInd in futures:
+                tmp_table = self.__operations[operationInd](
+                    tmp_table, futures[operationInd].result(), **kwargs)
+            elif operationInd in self.__join_graphs:
                 tmp_table = self.__operations[operationInd](
                     tmp_table, self.__join_graphs[operationInd].run(**kwargs), **kwargs)
             else:
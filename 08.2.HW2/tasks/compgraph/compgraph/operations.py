@@ -1,21 +1,51 @@
-import copy
+import functools
+import pickle
 import string
+import tempfile
 from abc import abstractmethod, ABC
+from collections import Counter
 import typing as tp
 import re
 import heapq
-from itertools import groupby
+from itertools import chain, groupby
+from operator import itemgetter
 import math
-import datetime
+import calendar
 
+try:
+    import numpy as np  # vectorized numeric kernels, optional
+except ImportError:
+    np = None  # type: ignore
+
+# Rows are copied shallowly (dict.copy) throughout the operations: values are
+# treated as immutable once inside the graph, so nested structures must not be
+# mutated downstream.
 TRow = dict[str, tp.Any]
 TRowsIterable = tp.Iterable[TRow]
 TRowsGenerator = tp.Generator[TRow, None, None]
 
 
+def _key_func(keys: tp.Sequence[str]) -> tp.Callable[[TRow], tuple[tp.Any, ...]]:
+    """Build a grouping key function which returns a tuple of key values
+
+    itemgetter extracts multi-key tuples in C; a single key is wrapped so the
+    result stays a tuple for callers that zip it with the key names (Join,
+    which only compares keys, uses a bare itemgetter instead).
+    """
+    if not keys:
+        return lambda row: ()
+    if len(keys) == 1:
+        getter = itemgetter(keys[0])
+        return lambda row: (getter(row),)
+    return itemgetter(*keys)
+
+
 class Operation(ABC):
     """Abstract Operation"""
 
+    # keys the output rows are guaranteed to be ordered by, () when unknown
+    output_sorted_by: tuple[str, ...] = ()
+
     @abstractmethod
     def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
         pass
@@ -60,24 +90,96 @@ class Mapper(ABC):
         pass
 
 
+def _haversine(lon1: float, lat1: float, lon2: float, lat2: float, radius: float) -> float:
+    """Great-circle distance in meters; plain scalar kernel, jit-friendly"""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = math.radians(lon2) - math.radians(lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * \
+        math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return radius * c * 1000
+
+
+class BatchMapper(Mapper):
+    """Mapper which can process rows a batch at a time (e.g. with numpy)"""
+
+    batch_size = 4096
+
+    @abstractmethod
+    def apply_batch(self, rows: list[TRow]) -> TRowsGenerator:
+        """
+        :param rows: buffered batch of table rows
+        """
+        pass
+
+    def __call__(self, row: TRow) -> TRowsGenerator:
+        yield from self.apply_batch([row])
+
+
 class Map(Operation):
     """Map class"""
 
     def __init__(self, mapper: Mapper) -> None:
         self._mapper = mapper
 
+    def fuse(self, mapper: Mapper) -> 'FusedMap | None':
+        # batch mappers must keep their own Map so the batched path stays active
+        if isinstance(self._mapper, BatchMapper) or isinstance(mapper, BatchMapper):
+            return None
+        return FusedMap((self._mapper, mapper))
+
     def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
+        mapper = self._mapper
+        if isinstance(mapper, BatchMapper):
+            batch_size = mapper.batch_size
+            batch: list[TRow] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_size:
+                    yield from mapper.apply_batch(batch)
+                    batch = []
+            if batch:
+                yield from mapper.apply_batch(batch)
+            return
         for row in rows:
-            yield from self._mapper(row)
+            yield from mapper(row)
+
+
+class FusedMap(Operation):
+    """Run several consecutive mappers in a single loop
+
+    Chained Map operations cost one generator frame per stage per row;
+    fusing them keeps the whole pipeline of short mappers in one frame.
+    """
+
+    def __init__(self, mappers: tp.Sequence[Mapper]) -> None:
+        self._mappers = tuple(mappers)
+
+    def fuse(self, mapper: Mapper) -> 'FusedMap | None':
+        if isinstance(mapper, BatchMapper):
+            return None
+        return FusedMap(self._mappers + (mapper,))
+
+    def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
+        first, *rest = self._mappers
+        for row in rows:
+            batch = list(first(row))
+            for mapper in rest:
+                batch = [out_row for mid_row in batch for out_row in mapper(mid_row)]
+            yield from batch
 
 
 class Reducer(ABC):
     """Base class for reducers"""
 
     @abstractmethod
-    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable) -> TRowsGenerator:
+    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable,
+                 group_values: tuple[tp.Any, ...] | None = None) -> TRowsGenerator:
         """
         :param rows: table rows
+        :param group_values: values of group_key for this group, when known by the caller
         """
         pass
 
@@ -87,11 +189,77 @@ class Reduce(Operation):
 
     def __init__(self, reducer: Reducer, keys: tp.Sequence[str]) -> None:
         self._reducer = reducer
-        self._keys = keys
+        self._keys = tuple(keys)
+        self._keyfunc = _key_func(keys)
+        self.output_sorted_by = self._keys
 
     def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
-        for _, rows in groupby(rows, key=lambda row: tuple(row[key] for key in self._keys)):
-            yield from self._reducer(tuple(self._keys), rows)
+        for key, rows in groupby(rows, key=self._keyfunc):
+            yield from self._reducer(self._keys, rows, key)
+
+
+class HashReduce(Operation):
+    """Reduce which groups rows through a hash table instead of requiring sorted input
+
+    Only valid for reducers whose result does not depend on row order inside
+    a group; buffers the grouped rows in memory.
+    """
+
+    def __init__(self, reducer: Reducer, keys: tp.Sequence[str]) -> None:
+        self._reducer = reducer
+        self._keys = tuple(keys)
+        self._keyfunc = _key_func(keys)
+
+    def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
+        keyfunc = self._keyfunc
+        groups: dict[tuple[tp.Any, ...], list[TRow]] = {}
+        for row in rows:
+            groups.setdefault(keyfunc(row), []).append(row)
+        for key, group in groups.items():
+            yield from self._reducer(self._keys, group, key)
+
+
+# rows of a join group buffered in memory before the rest spills to disk
+MATERIALIZE_THRESHOLD = 10_000
+
+
+class _ReplayableRows:
+    """Row storage a joiner can iterate several times with bounded memory
+
+    The first MATERIALIZE_THRESHOLD rows stay in a list; anything beyond
+    is pickled to a temporary file and replayed from there, giving skewed
+    join keys a block-nested-loop memory profile instead of an unbounded
+    in-memory tuple.
+    """
+
+    def __init__(self, rows: TRowsIterable, threshold: int = MATERIALIZE_THRESHOLD) -> None:
+        self._head: list[TRow] = []
+        self._spill: tp.IO[bytes] | None = None
+        it = iter(rows)
+        for row in it:
+            self._head.append(row)
+            if len(self._head) >= threshold:
+                break
+        else:
+            return
+        spill = tempfile.TemporaryFile()
+        dump = pickle.dump
+        for row in it:
+            dump(row, spill)
+        spill.flush()
+        self._spill = spill
+
+    def __iter__(self) -> tp.Iterator[TRow]:
+        yield from self._head
+        spill = self._spill
+        if spill is not None:
+            spill.seek(0)
+            load = pickle.load
+            while True:
+                try:
+                    yield load(spill)
+                except EOFError:
+                    return
 
 
 class Joiner(ABC):
@@ -100,6 +268,8 @@ class Joiner(ABC):
     def __init__(self, suffix_a: str = '_1', suffix_b: str = '_2') -> None:
         self._a_suffix = suffix_a
         self._b_suffix = suffix_b
+        # join keys are fixed for the operation the joiner belongs to
+        self._key_set: frozenset[str] | None = None
 
     @abstractmethod
     def __call__(self, keys: tp.Sequence[str], rows_a: TRowsIterable, rows_b: TRowsIterable) -> TRowsGenerator:
@@ -110,20 +280,18 @@ class Joiner(ABC):
         """
         pass
 
-    def _merge_row(self, keys: tp.Sequence[str], row_a: TRow, row_b: TRow) -> TRow:
-        result_row = {}
-        key_set = set(keys)
-        for key, val in row_a.items():
-            if key in row_b.keys() and key not in key_set:
-                result_row[key + self._a_suffix] = val
-            else:
-                result_row[key] = val
-        for key, val in row_b.items():
-            if key in row_a.keys() and key not in key_set:
-                result_row[key + self._b_suffix] = val
-            else:
-                result_row[key] = val
-        return result_row
+    def _overlap(self, keys: tp.Sequence[str], row_a: TRow, row_b: TRow) -> tp.AbstractSet[str]:
+        """Columns shared by both schemas which need suffixing (depends on schemas only)"""
+        key_set = self._key_set
+        if key_set is None:
+            key_set = self._key_set = frozenset(keys)
+        return (row_a.keys() & row_b.keys()) - key_set
+
+    @staticmethod
+    def _rename(row: TRow, overlap: tp.AbstractSet[str], suffix: str) -> TRow:
+        if not overlap:
+            return row
+        return {key + suffix if key in overlap else key: val for key, val in row.items()}
 
 
 class Join(Operation):
@@ -132,41 +300,69 @@ class Join(Operation):
     def __init__(self, joiner: Joiner, keys: tp.Sequence[str]):
         self._keys = keys
         self._joiner = joiner
+        # scalar key for the single-key case: comparing scalars in the merge
+        # loop is cheaper than comparing one-element tuples
+        self._keyfunc = itemgetter(keys[0]) if len(keys) == 1 else _key_func(keys)
+        self.output_sorted_by = tuple(keys)
+
+    _end_key: tp.Any = object()
+    _end: tp.Any = (_end_key, ())
 
     def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
-        rows_a: groupby[tuple[tp.Any, ...], TRow] = groupby(rows, key=lambda row: tuple(
-            row[key] for key in self._keys))
-        rows_b: groupby[tuple[tp.Any, ...], TRow] = groupby(args[0], key=lambda row: tuple(
-            row[key] for key in self._keys))
-        key_row_a = self._next_key_row(rows_a)
-        key_row_b = self._next_key_row(rows_b)
-        while True:
-            if key_row_a[0] == key_row_b[0]:
-                yield from self._joiner(self._keys, key_row_a[1], key_row_b[1])
-                key_row_a = self._next_key_row(rows_a)
-                key_row_b = self._next_key_row(rows_b)
-            elif key_row_a[0] < key_row_b[0]:
-                yield from self._joiner(self._keys, key_row_a[1], {})
-                key_row_a = self._next_key_row(rows_a)
+        rows_a: groupby[tp.Any, TRow] = groupby(rows, key=self._keyfunc)
+        rows_b: groupby[tp.Any, TRow] = groupby(args[0], key=self._keyfunc)
+        end = Join._end
+        end_key = Join._end_key
+        joiner = self._joiner
+        keys = self._keys
+        key_a, group_a = next(rows_a, end)
+        key_b, group_b = next(rows_b, end)
+        while key_a is not end_key and key_b is not end_key:
+            if key_a == key_b:
+                yield from joiner(keys, group_a, group_b)
+                key_a, group_a = next(rows_a, end)
+                key_b, group_b = next(rows_b, end)
+            elif key_a < key_b:
+                yield from joiner(keys, group_a, {})
+                key_a, group_a = next(rows_a, end)
             else:
-                yield from self._joiner(self._keys, {}, key_row_b[1])
-                key_row_b = self._next_key_row(rows_b)
-            if key_row_a == ((),{}):
-                while key_row_b != ((),{}):
-                    yield from self._joiner(self._keys, {}, key_row_b[1])
-                    key_row_b = self._next_key_row(rows_b)
-                break
-            if key_row_b == ((),{}):
-                while key_row_a != ((),{}):
-                    yield from self._joiner(self._keys, key_row_a[1], {})
-                    key_row_a = self._next_key_row(rows_a)
-                break
+                yield from joiner(keys, {}, group_b)
+                key_b, group_b = next(rows_b, end)
+        while key_a is not end_key:
+            yield from joiner(keys, group_a, {})
+            key_a, group_a = next(rows_a, end)
+        while key_b is not end_key:
+            yield from joiner(keys, {}, group_b)
+            key_b, group_b = next(rows_b, end)
+
+class BroadcastHashJoin(Operation):
+    """Join which buffers the (small) right side into a hash table and streams the left side"""
+
+    def __init__(self, joiner: Joiner, keys: tp.Sequence[str]):
+        self._keys = keys
+        self._joiner = joiner
+        self._keyfunc = itemgetter(keys[0]) if len(keys) == 1 else _key_func(keys)
+
+    def __call__(self, rows: TRowsIterable, *args: tp.Any, **kwargs: tp.Any) -> TRowsGenerator:
+        keyfunc = self._keyfunc
+        table: dict[tp.Any, list[TRow]] = {}
+        for row in args[0]:
+            table.setdefault(keyfunc(row), []).append(row)
+
+        joiner = self._joiner
+        keys = self._keys
+        matched: set[tp.Any] = set()
+        for key, group in groupby(rows, key=keyfunc):
+            rows_b = table.get(key)
+            if rows_b is None:
+                yield from joiner(keys, group, {})
+            else:
+                matched.add(key)
+                yield from joiner(keys, group, rows_b)
+        for key, rows_b in table.items():
+            if key not in matched:
+                yield from joiner(keys, {}, rows_b)
 
-    def _next_key_row(self, data):
-        try:
-            return next(data)
-        except StopIteration:
-            return ((),{})
 
 # Dummy operators
 
@@ -175,15 +371,16 @@ class DummyMapper(Mapper):
     """Yield exactly the row passed"""
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        yield copy.deepcopy(row)
+        yield row.copy()
 
 
 class FirstReducer(Reducer):
     """Yield only first row from passed ones"""
 
-    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable) -> TRowsGenerator:
+    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable,
+                 group_values: tuple[tp.Any, ...] | None = None) -> TRowsGenerator:
         for row in rows:
-            yield copy.deepcopy(row)
+            yield row.copy()
             break
 
 
@@ -193,6 +390,8 @@ class FirstReducer(Reducer):
 class FilterPunctuation(Mapper):
     """Left only non-punctuation symbols"""
 
+    _table = str.maketrans('', '', string.punctuation)
+
     def __init__(self, column: str):
         """
         :param column: name of column to process
@@ -200,9 +399,8 @@ class FilterPunctuation(Mapper):
         self._column = column
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        result_row = copy.deepcopy(row)
-        result_row[self._column] = row[self._column].translate(
-            str.maketrans('', '', string.punctuation))
+        result_row = row.copy()
+        result_row[self._column] = row[self._column].translate(self._table)
         yield result_row
 
 
@@ -216,7 +414,7 @@ class LowerCase(Mapper):
         self._column = column
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        result_row = copy.deepcopy(row)
+        result_row = row.copy()
         result_row[self._column] = row[self._column].lower()
         yield result_row
 
@@ -230,19 +428,57 @@ class Split(Mapper):
         :param separator: string to separate by
         """
         self._column = column
-        self._separator = r'\s+' if separator is None else re.escape(separator)
+        self._separator = separator
+        self._sep_len = 0 if separator is None else len(separator)
+        self._pattern = re.compile(r'\s+') if separator is None else None
+        # bound method saves two attribute hops per row on the whitespace path
+        self._finditer = None if self._pattern is None else self._pattern.finditer
+
+    # str.split would be faster still, but it materializes every token at
+    # once; splitting has to stay lazy so huge texts stream token by token
+    def __call__(self, row: TRow) -> TRowsGenerator:
+        column = self._column
+        text = row[column]
+        finditer = self._finditer
+        if finditer is not None:
+            l_str = 0
+            for match in finditer(text):
+                yield {**row, column: text[l_str:match.start()]}
+                l_str = match.end()
+            yield {**row, column: text[l_str:]}
+            return
+        sep = self._separator
+        sep_len = self._sep_len
+        find = text.find
+        l_str = 0
+        while True:
+            r_str = find(sep, l_str)
+            if r_str < 0:
+                yield {**row, column: text[l_str:]}
+                return
+            yield {**row, column: text[l_str:r_str]}
+            l_str = r_str + sep_len
+
+
+class TokenizeNormalize(Mapper):
+    """Filter punctuation, lower case and split a text column in one pass"""
+
+    _whitespace = re.compile(r'\s+')
+
+    def __init__(self, column: str) -> None:
+        """
+        :param column: name of column to process
+        """
+        self._column = column
+        self._table = str.maketrans('', '', string.punctuation)
 
     def __call__(self, row: TRow) -> TRowsGenerator:
+        text = row[self._column].translate(self._table).lower()
         l_str = 0
-        for r_str in re.finditer(self._separator, row[self._column]):
-            yield self._create_row(row, l_str, r_str.start())
-            l_str = r_str.end()
-        yield self._create_row(row, l_str, len(row[self._column]))
-
-    def _create_row(self, row: TRow, l_str: int, r_str: int) -> TRow:
-        result_row = copy.deepcopy(row)
-        result_row[self._column] = row[self._column][l_str:r_str]
-        return result_row
+        for match in self._whitespace.finditer(text):
+            yield {**row, self._column: text[l_str:match.start()]}
+            l_str = match.end()
+        yield {**row, self._column: text[l_str:]}
 
 
 class Product(Mapper):
@@ -255,12 +491,17 @@ class Product(Mapper):
         """
         self._columns = columns
         self._result_column = result_column
+        # straight-line product expression specialized for these columns;
+        # the leading 1 keeps the historic `result = 1; result *= ...` coercion
+        if columns:
+            source = 'lambda row: 1 * ' + ' * '.join(f'row[{column!r}]' for column in columns)
+            self._compute = eval(source, {})
+        else:
+            self._compute = lambda row: 1
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        result_row = copy.deepcopy(row)
-        result_row[self._result_column] = 1
-        for col in self._columns:
-            result_row[self._result_column] *= row[col]
+        result_row = row.copy()
+        result_row[self._result_column] = self._compute(row)
         yield result_row
 
 
@@ -275,10 +516,10 @@ class Filter(Mapper):
 
     def __call__(self, row: TRow) -> TRowsGenerator:
         if self._condition(row):
-            yield copy.deepcopy(row)
+            yield row.copy()
 
 
-class CalculateDistance(Mapper):
+class CalculateDistance(BatchMapper):
     """Calculates the distance between 2 points using the haversine distance"""
 
     def __init__(self, start: str, finish: str, column: str, R: float = 6373.0) -> None:
@@ -293,28 +534,33 @@ class CalculateDistance(Mapper):
         self._column = column
         self._R = R
 
-    def __call__(self, row: TRow) -> TRowsGenerator:
+    def apply_batch(self, rows: list[TRow]) -> TRowsGenerator:
+        if np is None or len(rows) == 1:
+            for row in rows:
+                yield self._one_row(row)
+            return
+        start = np.radians(np.array([row[self._strat] for row in rows], dtype=np.float64))
+        end = np.radians(np.array([row[self._finish] for row in rows], dtype=np.float64))
+        dlon = end[:, 0] - start[:, 0]
+        dlat = end[:, 1] - start[:, 1]
+        a = np.sin(dlat * 0.5) ** 2 + np.cos(start[:, 1]) * \
+            np.cos(end[:, 1]) * np.sin(dlon * 0.5) ** 2
+        distance_m = (2 * 1000 * self._R) * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        for row, dist in zip(rows, distance_m.tolist()):
+            result_row = row.copy()
+            result_row[self._column] = dist
+            yield result_row
+
+    def _one_row(self, row: TRow) -> TRow:
         start_lon, start_lat = row[self._strat]
         end_lon, end_lat = row[self._finish]
-
-        lat1_rad = math.radians(start_lat)
-        lon1_rad = math.radians(start_lon)
-        lat2_rad = math.radians(end_lat)
-        lon2_rad = math.radians(end_lon)
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-        a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * \
-            math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        distance_m = self._R * c * 1000
-
-        result_row = copy.deepcopy(row)
-        result_row[self._column] = distance_m
-
-        yield result_row
+        result_row = row.copy()
+        result_row[self._column] = _haversine(
+            start_lon, start_lat, end_lon, end_lat, self._R)
+        return result_row
 
 
-class CalculateSpeed(Mapper):
+class CalculateSpeed(BatchMapper):
     """Calculates speed based on distance and time"""
 
     def __init__(self, dist: str, time_second: str, column: str) -> None:
@@ -327,11 +573,20 @@ class CalculateSpeed(Mapper):
         self._time_second = time_second
         self._column = column
 
-    def __call__(self, row: TRow) -> TRowsGenerator:
-        result_row = copy.deepcopy(row)
-        result_row[self._column] = row[self._dist] * \
-            3.6 / row[self._time_second]
-        yield result_row
+    def apply_batch(self, rows: list[TRow]) -> TRowsGenerator:
+        if np is None or len(rows) == 1:
+            for row in rows:
+                result_row = row.copy()
+                result_row[self._column] = row[self._dist] * \
+                    3.6 / row[self._time_second]
+                yield result_row
+            return
+        dist = np.array([row[self._dist] for row in rows], dtype=np.float64)
+        seconds = np.array([row[self._time_second] for row in rows], dtype=np.float64)
+        for row, speed in zip(rows, (dist * 3.6 / seconds).tolist()):
+            result_row = row.copy()
+            result_row[self._column] = speed
+            yield result_row
 
 
 class CalculateTime(Mapper):
@@ -339,35 +594,49 @@ class CalculateTime(Mapper):
 
     weekdays = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
 
-    def __init__(self, start: str, finish: str, column_weekday: str, column_hour: str, column_second: str) -> None:
+    def __init__(self, start: str, finish: str, column_weekday: str, column_hour: str, column_second: str,
+                 as_category: bool = False) -> None:
         """
         :param start: start time
         :param finish: finish time
         :param column_weakdey: column time in weak day
         :param column_hour: column for time in hour
         :param column_second: column for time in second
+        :param as_category: emit the weekday as its 0-6 code instead of a name,
+            so downstream grouping hashes a small int; plot_img decodes it back
         """
         self._strat = start
         self._finish = finish
         self._column_weekday = column_weekday
         self._column_hour = column_hour
         self._column_second = column_second
+        self._as_category = as_category
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        st_time = self._parse_time(row[self._strat])
-        f_time = self._parse_time(row[self._finish])
-        result_row = copy.deepcopy(row)
-        result_row[self._column_second] = (f_time - st_time).total_seconds()
-        result_row[self._column_weekday] = self.weekdays[st_time.weekday()]
-        result_row[self._column_hour] = st_time.hour
+        st_micros, st_weekday, st_hour = self._parse_stamp(row[self._strat])
+        f_micros, _, _ = self._parse_stamp(row[self._finish])
+        result_row = row.copy()
+        result_row[self._column_second] = (f_micros - st_micros) / 1_000_000
+        result_row[self._column_weekday] = st_weekday if self._as_category else self.weekdays[st_weekday]
+        result_row[self._column_hour] = st_hour
         yield result_row
 
-    def _parse_time(self, time: str) -> datetime.datetime:
-        main_part, fractional = time.split('.')
-        dt = datetime.datetime.strptime(main_part, '%Y%m%dT%H%M%S')
-        microseconds = int(float('0.' + fractional) * 1_000_000)
-        dt = dt.replace(microsecond=microseconds)
-        return dt
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_stamp(time: str) -> tuple[int, int, int]:
+        """(microseconds since epoch, weekday index, hour) of a timestamp
+
+        The fixed 'YYYYMMDDTHHMMSS.ffffff' layout is parsed with integer
+        slicing instead of strptime, and no datetime object is built: the
+        epoch count gives the duration and the weekday (the epoch started
+        on a Thursday, hence the +3). Replay logs repeat timestamps often
+        enough for the cache to pay off.
+        """
+        microseconds = int(float(time[15:]) * 1_000_000) if len(time) > 16 else 0
+        seconds = calendar.timegm((
+            int(time[0:4]), int(time[4:6]), int(time[6:8]),
+            int(time[9:11]), int(time[11:13]), int(time[13:15]), 0, 0, 0))
+        return seconds * 1_000_000 + microseconds, (seconds // 86400 + 3) % 7, int(time[9:11])
 
 
 class Project(Mapper):
@@ -378,9 +647,13 @@ class Project(Mapper):
         :param columns: names of columns
         """
         self._columns = columns
+        self._getter = itemgetter(*columns) if len(columns) > 1 else None
 
     def __call__(self, row: TRow) -> TRowsGenerator:
-        yield {col_name: copy.deepcopy(row[col_name]) for col_name in self._columns}
+        if self._getter is not None:
+            yield dict(zip(self._columns, self._getter(row)))
+        else:
+            yield {col_name: row[col_name] for col_name in self._columns}
 
 
 # Reducers
@@ -394,7 +667,8 @@ class CountRow(Reducer):
         """
         self._column_max = column
 
-    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable) -> TRowsGenerator:
+    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable,
+                 group_values: tuple[tp.Any, ...] | None = None) -> TRowsGenerator:
         ln = 0
         for row in rows:
             ln += 1
@@ -412,9 +686,10 @@ class TopN(Reducer):
         self._column_max = column
         self._n = n
 
-    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable) -> TRowsGenerator:
+    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable,
+                 group_values: tuple[tp.Any, ...] | None = None) -> TRowsGenerator:
         for result_row in heapq.nlargest(self._n, rows, key=lambda row: row[self._column_max]):
-            yield copy.deepcopy(result_row)
+            yield result_row.copy()
 
 
 class TermFrequency(Reducer):
@@ -428,23 +703,23 @@ class TermFrequency(Reducer):
         self._words_column = words_column
         self._result_column = result_column
 
-    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable) -> TRowsGenerator:
-        row_dict: dict[tp.Any, TRow] = {}
-        len_row_dict: dict[tp.Any, int] = {}
-        len_rows = 0
+    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable,
+                 group_values: tuple[tp.Any, ...] | None = None) -> TRowsGenerator:
+        words_column = self._words_column
+        counts: Counter[tp.Any] = Counter()
+        base: TRow | None = None if group_values is None else dict(zip(group_key, group_values))
         for row in rows:
-            len_rows += 1
-            if row[self._words_column] in len_row_dict:
-                len_row_dict[row[self._words_column]] += 1
-            else:
-                len_row_dict[row[self._words_column]] = 1
-                row_dict[row[self._words_column]] = {
-                    key: row[key] for key in group_key}
-
-        for key, row in row_dict.items():
-            result_row = row
-            result_row[self._result_column] = len_row_dict[key] / len_rows
-            result_row[self._words_column] = key
+            counts[row[words_column]] += 1
+            if base is None:
+                base = {key: row[key] for key in group_key}
+
+        if base is None:
+            base = {}
+        inv_len = 1.0 / counts.total()
+        for word, count in counts.items():
+            result_row = base.copy()
+            result_row[self._result_column] = count * inv_len
+            result_row[words_column] = word
             yield result_row
 
 
@@ -464,16 +739,17 @@ class Count(Reducer):
         """
         self._column = column
 
-    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable) -> TRowsGenerator:
-        fl: bool = True
-        result: TRow = {}
-        count: int = 0
-        for row in rows:
-            count += 1
-            if fl:
-                result = {key: row[key] for key in group_key}
-                fl = False
-        result[self._column] = count
+    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable,
+                 group_values: tuple[tp.Any, ...] | None = None) -> TRowsGenerator:
+        if group_values is not None:
+            result: TRow = dict(zip(group_key, group_values))
+            result[self._column] = sum(1 for _ in rows)
+            yield result
+            return
+        it = iter(rows)
+        first = next(it, None)
+        result = {} if first is None else {key: first[key] for key in group_key}
+        result[self._column] = 0 if first is None else 1 + sum(1 for _ in it)
         yield result
 
 
@@ -493,16 +769,21 @@ class Sum(Reducer):
         """
         self._column = column
 
-    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable) -> TRowsGenerator:
-        fl: bool = True
-        result: TRow = {}
-        sum: int = 0
-        for row in rows:
-            sum += row[self._column]
-            if fl:
-                result = {key: row[key] for key in group_key}
-                fl = False
-        result[self._column] = sum
+    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable,
+                 group_values: tuple[tp.Any, ...] | None = None) -> TRowsGenerator:
+        column = self._column
+        if group_values is not None:
+            result: TRow = dict(zip(group_key, group_values))
+            result[column] = sum(row[column] for row in rows)
+            yield result
+            return
+        it = iter(rows)
+        first = next(it, None)
+        if first is None:
+            yield {column: 0}
+            return
+        result = {key: first[key] for key in group_key}
+        result[column] = first[column] + sum(row[column] for row in it)
         yield result
 
 
@@ -522,18 +803,23 @@ class Mean(Reducer):
         """
         self._column = column
 
-    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable) -> TRowsGenerator:
-        fl: bool = True
-        result: TRow = {}
-        sum: int = 0
-        count: int = 0
-        for row in rows:
-            sum += row[self._column]
+    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable,
+                 group_values: tuple[tp.Any, ...] | None = None) -> TRowsGenerator:
+        column = self._column
+        it = iter(rows)
+        if group_values is not None:
+            result: TRow = dict(zip(group_key, group_values))
+            total = 0
+            count = 0
+        else:
+            first = next(it)
+            result = {key: first[key] for key in group_key}
+            total = first[column]
+            count = 1
+        for row in it:
+            total += row[column]
             count += 1
-            if fl:
-                result = {key: row[key] for key in group_key}
-                fl = False
-        result[self._column] = sum / count
+        result[column] = total / count
         yield result
 
 
@@ -554,9 +840,22 @@ class Tf_idf(Reducer):
         self._col_word = col_word
         self._column = column
 
-    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable) -> TRowsGenerator:
+    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable,
+                 group_values: tuple[tp.Any, ...] | None = None) -> TRowsGenerator:
+        base: TRow | None = None if group_values is None else dict(zip(group_key, group_values))
+        if np is not None:
+            rows = list(rows)
+            freq = np.array([row[self._freq] for row in rows], dtype=np.float64)
+            total = np.array([row[self._ln] for row in rows], dtype=np.float64)
+            with_word = np.array([row[self._col_word] for row in rows], dtype=np.float64)
+            values = (freq * np.log(total / with_word)).tolist()
+            for row, value in zip(rows, values):
+                result_row = {key: row[key] for key in group_key} if base is None else dict(base)
+                result_row[self._column] = value
+                yield result_row
+            return
         for row in rows:
-            result_row = {key: row[key] for key in group_key}
+            result_row = {key: row[key] for key in group_key} if base is None else dict(base)
             result_row[self._column] = row[self._freq] * \
                 math.log(row[self._ln] / row[self._col_word])
             yield result_row
@@ -577,9 +876,21 @@ class Pmi(Reducer):
         self._freq_all = freq_all
         self._column = column
 
-    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable) -> TRowsGenerator:
+    def __call__(self, group_key: tuple[str, ...], rows: TRowsIterable,
+                 group_values: tuple[tp.Any, ...] | None = None) -> TRowsGenerator:
+        base: TRow | None = None if group_values is None else dict(zip(group_key, group_values))
+        if np is not None:
+            rows = list(rows)
+            frec = np.array([row[self._frec] for row in rows], dtype=np.float64)
+            freq_all = np.array([row[self._freq_all] for row in rows], dtype=np.float64)
+            values = np.log(frec / freq_all).tolist()
+            for row, value in zip(rows, values):
+                result_row = {key: row[key] for key in group_key} if base is None else dict(base)
+                result_row[self._column] = value
+                yield result_row
+            return
         for row in rows:
-            result_row = {key: row[key] for key in group_key}
+            result_row = {key: row[key] for key in group_key} if base is None else dict(base)
             result_row[self._column] = math.log(
                 row[self._frec] / row[self._freq_all])
             yield result_row
@@ -592,54 +903,120 @@ class InnerJoiner(Joiner):
     """Join with inner strategy"""
 
     def __call__(self, keys: tp.Sequence[str], rows_a: TRowsIterable, rows_b: TRowsIterable) -> TRowsGenerator:
-        rows_b_tuple = tuple(rows_b)
-        for row_a in rows_a:
-            for row_b in rows_b_tuple:
-                yield self._merge_row(keys, row_a, row_b)
+        it_a = iter(rows_a)
+        first_a = next(it_a, None)
+        if first_a is None:
+            return
+        it_b = iter(rows_b)
+        first_b = next(it_b, None)
+        if first_b is None:
+            return
+        overlap = self._overlap(keys, first_a, first_b)
+        rename = self._rename
+        b_suffix = self._b_suffix
+        second_a = next(it_a, None)
+        if second_a is None:
+            # single left row: stream the right side, no buffering needed
+            a_renamed = rename(first_a, overlap, self._a_suffix)
+            for row_b in chain((first_b,), it_b):
+                yield {**a_renamed, **rename(row_b, overlap, b_suffix)}
+            return
+        b_renamed = _ReplayableRows(rename(row_b, overlap, b_suffix) for row_b in chain((first_b,), it_b))
+        for row_a in chain((first_a, second_a), it_a):
+            a_renamed = rename(row_a, overlap, self._a_suffix)
+            for row_b in b_renamed:
+                yield {**a_renamed, **row_b}
 
 
 class OuterJoiner(Joiner):
     """Join with outer strategy"""
 
     def __call__(self, keys: tp.Sequence[str], rows_a: TRowsIterable, rows_b: TRowsIterable) -> TRowsGenerator:
-        rows_b_tuple = tuple(rows_b)
-        if rows_b_tuple:
-            a_is_empty = True
-            for row_a in rows_a:
-                a_is_empty = False
-                for row_b in rows_b_tuple:
-                    yield self._merge_row(keys, row_a, row_b)
-            if a_is_empty:
-                for row in rows_b_tuple:
-                    yield row
-        else:
-            for row in rows_a:
-                yield row
+        it_a = iter(rows_a)
+        first_a = next(it_a, None)
+        it_b = iter(rows_b)
+        first_b = next(it_b, None)
+        if first_b is None:
+            if first_a is not None:
+                yield first_a
+                yield from it_a
+            return
+        if first_a is None:
+            yield first_b
+            yield from it_b
+            return
+        overlap = self._overlap(keys, first_a, first_b)
+        rename = self._rename
+        b_suffix = self._b_suffix
+        second_a = next(it_a, None)
+        if second_a is None:
+            # single left row: stream the right side, no buffering needed
+            a_renamed = rename(first_a, overlap, self._a_suffix)
+            for row_b in chain((first_b,), it_b):
+                yield {**a_renamed, **rename(row_b, overlap, b_suffix)}
+            return
+        b_renamed = _ReplayableRows(rename(row_b, overlap, b_suffix) for row_b in chain((first_b,), it_b))
+        for row_a in chain((first_a, second_a), it_a):
+            a_renamed = rename(row_a, overlap, self._a_suffix)
+            for row_b in b_renamed:
+                yield {**a_renamed, **row_b}
 
 
 class LeftJoiner(Joiner):
     """Join with left strategy"""
 
     def __call__(self, keys: tp.Sequence[str], rows_a: TRowsIterable, rows_b: TRowsIterable) -> TRowsGenerator:
-        rows_b_tuple = tuple(rows_b)
-        if rows_b_tuple:
-            for row_a in rows_a:
-                for row_b in rows_b_tuple:
-                    yield self._merge_row(keys, row_a, row_b)
-        else:
-            for row in rows_a:
-                yield row
+        it_b = iter(rows_b)
+        first_b = next(it_b, None)
+        if first_b is None:
+            yield from rows_a
+            return
+        it_a = iter(rows_a)
+        first_a = next(it_a, None)
+        if first_a is None:
+            return
+        overlap = self._overlap(keys, first_a, first_b)
+        rename = self._rename
+        b_suffix = self._b_suffix
+        second_a = next(it_a, None)
+        if second_a is None:
+            # single left row: stream the right side, no buffering needed
+            a_renamed = rename(first_a, overlap, self._a_suffix)
+            for row_b in chain((first_b,), it_b):
+                yield {**a_renamed, **rename(row_b, overlap, b_suffix)}
+            return
+        b_renamed = _ReplayableRows(rename(row_b, overlap, b_suffix) for row_b in chain((first_b,), it_b))
+        for row_a in chain((first_a, second_a), it_a):
+            a_renamed = rename(row_a, overlap, self._a_suffix)
+            for row_b in b_renamed:
+                yield {**a_renamed, **row_b}
 
 
 class RightJoiner(Joiner):
     """Join with right strategy"""
 
     def __call__(self, keys: tp.Sequence[str], rows_a: TRowsIterable, rows_b: TRowsIterable) -> TRowsGenerator:
-        rows_a_tuple = tuple(rows_a)
-        if rows_a_tuple:
-            for row_b in rows_b:
-                for row_a in rows_a_tuple:
-                    yield self._merge_row(keys, row_a, row_b)
-        else:
-            for row in rows_b:
-                yield row
+        it_a = iter(rows_a)
+        first_a = next(it_a, None)
+        if first_a is None:
+            yield from rows_b
+            return
+        it_b = iter(rows_b)
+        first_b = next(it_b, None)
+        if first_b is None:
+            return
+        overlap = self._overlap(keys, first_a, first_b)
+        rename = self._rename
+        a_suffix = self._a_suffix
+        second_b = next(it_b, None)
+        if second_b is None:
+            # single right row: stream the left side, no buffering needed
+            b_renamed = rename(first_b, overlap, self._b_suffix)
+            for row_a in chain((first_a,), it_a):
+                yield {**rename(row_a, overlap, a_suffix), **b_renamed}
+            return
+        a_renamed = _ReplayableRows(rename(row_a, overlap, a_suffix) for row_a in chain((first_a,), it_a))
+        for row_b in chain((first_b, second_b), it_b):
+            b_renamed = rename(row_b, overlap, self._b_suffix)
+            for row_a in a_renamed:
+                yield {**row_a, **b_renamed}
@@ -1,35 +1,54 @@
 from pathlib import Path
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 from compgraph import operations
 
 
 def plot_img(data: operations.TRowsIterable, result_path: Path):
-    df = pd.DataFrame(list(data))
     weekday_order = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    # build typed columns in one pass over the stream: no intermediate list of
+    # row dicts, and the frame gets compact numpy-backed blocks directly
+    weekdays: list[str] = []
+    hours: list[int] = []
+    speeds: list[float] = []
+    for row in data:
+        weekdays.append(row['weekday'])
+        hours.append(row['hour'])
+        speeds.append(row['speed'])
+    if weekdays and not isinstance(weekdays[0], str):
+        # dictionary-encoded weekdays (CalculateTime with as_category=True)
+        weekdays = [weekday_order[int(code)] for code in weekdays]
+    df = pd.DataFrame({
+        # ordered categorical lets one sort+groupby replace a boolean mask per day
+        'weekday': pd.Categorical(weekdays, categories=weekday_order, ordered=True),
+        'hour': np.asarray(hours, dtype=np.int8),
+        'speed': np.asarray(speeds, dtype=np.float32),
+    })
     plt.figure(figsize=(12, 7))
     colors = plt.cm.Set3.colors # pyrefly: ignore
-    for i, weekday in enumerate(weekday_order):
-        day_data = df[df['weekday'] == weekday]
-        if not day_data.empty:
-            day_data = day_data.sort_values('hour') # pyrefly: ignore
-            plt.plot(day_data['hour'], day_data['speed'],
-                     marker='o',
-                     linewidth=3,
-                     markersize=8,
-                     color=colors[i % len(colors)],
-                     label=f'{weekday}',
-                     alpha=0.8)
-
-            for _, row in day_data.iterrows():
-                plt.annotate(f"{row['speed']:.1f}",
-                             (float(row['hour']), float(row['speed'])),
-                             textcoords="offset points",
-                             xytext=(0, 10),
-                             ha='center',
-                             fontsize=9,
-                             fontweight='bold')
+    grouped = df.sort_values(['weekday', 'hour']).groupby('weekday', observed=True, sort=False)
+    for weekday, day_data in grouped:
+        i = weekday_order.index(str(weekday))
+        hours = day_data['hour'].to_numpy()
+        speeds = day_data['speed'].to_numpy()
+        plt.plot(hours, speeds,
+                 marker='o',
+                 linewidth=3,
+                 markersize=8,
+                 color=colors[i % len(colors)],
+                 label=f'{weekday}',
+                 alpha=0.8)
+
+        for hour, speed in zip(hours.tolist(), speeds.tolist()):
+            plt.annotate(f"{speed:.1f}",
+                         (float(hour), float(speed)),
+                         textcoords="offset points",
+                         xytext=(0, 10),
+                         ha='center',
+                         fontsize=9,
+                         fontweight='bold')
 
     plt.xlabel('Час дня', fontsize=12, fontweight='bold')
     plt.ylabel('Средняя скорость (км/ч)', fontsize=12, fontweight='bold')
@@ -42,7 +61,7 @@ def plot_img(data: operations.TRowsIterable, result_path: Path):
     plt.xticks(range(0, 25, 2), fontsize=10)
     plt.yticks(fontsize=10)
     plt.xlim(0, 24)
-    plt.ylim(0, max(df['speed']) * 1.2)
+    plt.ylim(0, df['speed'].max() * 1.2)
 
     plt.gca().set_axisbelow(True)
 
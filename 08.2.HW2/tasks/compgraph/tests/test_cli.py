@@ -1,5 +1,4 @@
 import json
-import tempfile
 from pathlib import Path
 from typing import List, Dict, Any
 
@@ -10,15 +9,22 @@ from operator import itemgetter
 
 from compgraph.cli import cli
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
-def create_temp_file(data: List[Dict[str, Any]]) -> Path:
-    """Helper to create temporary JSONL file"""
-    temp_file = tempfile.NamedTemporaryFile(
-        mode='w', suffix='.jsonl', delete=False)
-    for item in data:
-        temp_file.write(json.dumps(item) + '\n')
-    temp_file.close()
-    return Path(temp_file.name)
+
+def encode_jsonl(data: List[Dict[str, Any]]) -> bytes:
+    """Serialize rows to JSONL bytes once, at import time"""
+    if orjson is not None:
+        return b''.join(orjson.dumps(item) + b'\n' for item in data)
+    return ''.join(json.dumps(item) + '\n' for item in data).encode()
+
+
+def read_output(path: Path) -> List[Dict[str, Any]]:
+    """Helper to read back a JSONL output file in one read"""
+    return [json.loads(line) for line in path.read_text().splitlines()]
 
 
 @pytest.fixture
@@ -26,133 +32,121 @@ def runner() -> CliRunner:
     return CliRunner()
 
 
-def test_word_count_cli(runner: CliRunner) -> None:
+# fixture rows do not vary between runs, so they are serialized once at
+# collection time and each test only pays for a single write_bytes
+WORD_COUNT_BYTES = encode_jsonl([
+    {"doc_id": 1, "text": "hello world hello"},
+    {"doc_id": 2, "text": "world test"},
+])
+
+
+def test_word_count_cli(runner: CliRunner, tmp_path: Path) -> None:
     """Test word count CLI command"""
-    test_data = [
-        {"doc_id": 1, "text": "hello world hello"},
-        {"doc_id": 2, "text": "world test"},
-    ]
+    input_file = tmp_path / 'in.jsonl'
+    input_file.write_bytes(WORD_COUNT_BYTES)
+    output_file = tmp_path / 'out.jsonl'
 
-    input_file = create_temp_file(test_data)
-    output_file = Path(tempfile.mktemp(suffix='.jsonl'))
+    result = runner.invoke(
+        cli,
+        ['word-count', str(input_file), str(output_file)]
+    )
 
-    try:
-        result = runner.invoke(
-            cli,
-            ['word-count', str(input_file), str(output_file)]
-        )
+    assert result.exit_code == 0
+    assert "Word count completed" in result.output
 
-        assert result.exit_code == 0
-        assert "Word count completed" in result.output
+    # Check output file
+    output = read_output(output_file)
 
-        # Check output file
-        with open(output_file, 'r') as f:
-            output = [json.loads(line) for line in f]
+    expected = [
+        {"text": "hello", "count": 2},
+        {"text": "world", "count": 2},
+        {"text": "test", "count": 1},
+    ]
 
-        expected = [
-            {"text": "hello", "count": 2},
-            {"text": "world", "count": 2},
-            {"text": "test", "count": 1},
-        ]
+    # Sort for comparison
+    output_sorted = sorted(output, key=lambda x: x['text'])
+    expected_sorted = sorted(expected, key=lambda x: x['text'])
 
-        # Sort for comparison
-        output_sorted = sorted(output, key=lambda x: x['text'])
-        expected_sorted = sorted(expected, key=lambda x: x['text'])
+    assert output_sorted == expected_sorted
 
-        assert output_sorted == expected_sorted
 
-    finally:
-        input_file.unlink(missing_ok=True)
-        output_file.unlink(missing_ok=True)
+TF_IDF_BYTES = encode_jsonl([
+    {'doc_id': 1, 'text': 'hello, little world'},
+    {'doc_id': 2, 'text': 'little'},
+    {'doc_id': 3, 'text': 'little little little'},
+    {'doc_id': 4, 'text': 'little? hello little world'},
+    {'doc_id': 5, 'text': 'HELLO HELLO! WORLD...'},
+    {'doc_id': 6, 'text': 'world? world... world!!! WORLD!!! HELLO!!!'}
+])
 
 
-def test_tf_idf_cli(runner: CliRunner) -> None:
+def test_tf_idf_cli(runner: CliRunner, tmp_path: Path) -> None:
     """Test inverted index CLI command"""
-    test_data = [
-        {'doc_id': 1, 'text': 'hello, little world'},
-        {'doc_id': 2, 'text': 'little'},
-        {'doc_id': 3, 'text': 'little little little'},
-        {'doc_id': 4, 'text': 'little? hello little world'},
-        {'doc_id': 5, 'text': 'HELLO HELLO! WORLD...'},
-        {'doc_id': 6, 'text': 'world? world... world!!! WORLD!!! HELLO!!!'}
-    ]
+    input_file = tmp_path / 'in.jsonl'
+    input_file.write_bytes(TF_IDF_BYTES)
+    output_file = tmp_path / 'out.jsonl'
 
-    input_file = create_temp_file(test_data)
-    output_file = Path(tempfile.mktemp(suffix='.jsonl'))
+    result = runner.invoke(
+        cli, ['inverted-index', str(input_file), str(output_file)])
+    assert result.exit_code == 0
 
-    try:
-        result = runner.invoke(
-            cli, ['inverted-index', str(input_file), str(output_file)])
-        assert result.exit_code == 0
+    # Check output file
+    output = read_output(output_file)
 
-        # Check output file
-        with open(output_file, 'r') as f:
-            output = [json.loads(line) for line in f]
+    expected = [
+        {'doc_id': 1, 'text': 'hello', 'tf_idf': approx(0.1351, 0.001)},
+        {'doc_id': 1, 'text': 'world', 'tf_idf': approx(0.1351, 0.001)},
 
-        expected = [
-            {'doc_id': 1, 'text': 'hello', 'tf_idf': approx(0.1351, 0.001)},
-            {'doc_id': 1, 'text': 'world', 'tf_idf': approx(0.1351, 0.001)},
+        {'doc_id': 2, 'text': 'little', 'tf_idf': approx(0.4054, 0.001)},
 
-            {'doc_id': 2, 'text': 'little', 'tf_idf': approx(0.4054, 0.001)},
+        {'doc_id': 3, 'text': 'little', 'tf_idf': approx(0.4054, 0.001)},
 
-            {'doc_id': 3, 'text': 'little', 'tf_idf': approx(0.4054, 0.001)},
+        {'doc_id': 4, 'text': 'hello', 'tf_idf': approx(0.1013, 0.001)},
+        {'doc_id': 4, 'text': 'little', 'tf_idf': approx(0.2027, 0.001)},
 
-            {'doc_id': 4, 'text': 'hello', 'tf_idf': approx(0.1013, 0.001)},
-            {'doc_id': 4, 'text': 'little', 'tf_idf': approx(0.2027, 0.001)},
+        {'doc_id': 5, 'text': 'hello', 'tf_idf': approx(0.2703, 0.001)},
+        {'doc_id': 5, 'text': 'world', 'tf_idf': approx(0.1351, 0.001)},
 
-            {'doc_id': 5, 'text': 'hello', 'tf_idf': approx(0.2703, 0.001)},
-            {'doc_id': 5, 'text': 'world', 'tf_idf': approx(0.1351, 0.001)},
+        {'doc_id': 6, 'text': 'world', 'tf_idf': approx(0.3243, 0.001)}
+    ]
 
-            {'doc_id': 6, 'text': 'world', 'tf_idf': approx(0.3243, 0.001)}
-        ]
+    assert sorted(output, key=itemgetter('doc_id', 'text')) == expected
 
-        assert sorted(output, key=itemgetter('doc_id', 'text')) == expected
 
-    finally:
-        input_file.unlink(missing_ok=True)
-        output_file.unlink(missing_ok=True)
+PMI_BYTES = encode_jsonl([
+    {'doc_id': 1, 'text': 'hello, little world'},
+    {'doc_id': 2, 'text': 'little'},
+    {'doc_id': 3, 'text': 'little little little'},
+    {'doc_id': 4, 'text': 'little? hello little world'},
+    {'doc_id': 5, 'text': 'HELLO HELLO! WORLD...'},
+    {'doc_id': 6, 'text': 'world? world... world!!! WORLD!!! HELLO!!! HELLO!!!!!!!'}
+])
 
 
-def test_pmi_cli(runner: CliRunner) -> None:
+def test_pmi_cli(runner: CliRunner, tmp_path: Path) -> None:
     """Test inverted index CLI command"""
-    test_data = [
-        {'doc_id': 1, 'text': 'hello, little world'},
-        {'doc_id': 2, 'text': 'little'},
-        {'doc_id': 3, 'text': 'little little little'},
-        {'doc_id': 4, 'text': 'little? hello little world'},
-        {'doc_id': 5, 'text': 'HELLO HELLO! WORLD...'},
-        {'doc_id': 6, 'text': 'world? world... world!!! WORLD!!! HELLO!!! HELLO!!!!!!!'}
+    input_file = tmp_path / 'in.jsonl'
+    input_file.write_bytes(PMI_BYTES)
+    output_file = tmp_path / 'out.jsonl'
+
+    result = runner.invoke(cli, ['pmi', str(input_file), str(output_file)])
+    assert result.exit_code == 0
+
+    # Check output file
+    output = read_output(output_file)
+
+    expected = [  # Mind the order !!!
+        {'doc_id': 3, 'text': 'little', 'pmi': approx(0.9555, 0.001)},
+        {'doc_id': 4, 'text': 'little', 'pmi': approx(0.9555, 0.001)},
+        {'doc_id': 5, 'text': 'hello', 'pmi': approx(1.1786, 0.001)},
+        {'doc_id': 6, 'text': 'world', 'pmi': approx(0.7731, 0.001)},
+        {'doc_id': 6, 'text': 'hello', 'pmi': approx(0.0800, 0.001)},
     ]
 
-    input_file = create_temp_file(test_data)
-    output_file = Path(tempfile.mktemp(suffix='.jsonl'))
-
-    try:
-        result = runner.invoke(cli, ['pmi', str(input_file), str(output_file)])
-        assert result.exit_code == 0
-
-        # Check output file
-        with open(output_file, 'r') as f:
-            output = [json.loads(line) for line in f]
+    assert output == expected
 
-        expected = [  # Mind the order !!!
-            {'doc_id': 3, 'text': 'little', 'pmi': approx(0.9555, 0.001)},
-            {'doc_id': 4, 'text': 'little', 'pmi': approx(0.9555, 0.001)},
-            {'doc_id': 5, 'text': 'hello', 'pmi': approx(1.1786, 0.001)},
-            {'doc_id': 6, 'text': 'world', 'pmi': approx(0.7731, 0.001)},
-            {'doc_id': 6, 'text': 'hello', 'pmi': approx(0.0800, 0.001)},
-        ]
 
-        assert output == expected
-
-    finally:
-        input_file.unlink(missing_ok=True)
-        output_file.unlink(missing_ok=True)
-
-
-def test_yandex_maps_cli(runner: CliRunner) -> None:
-    """Test inverted index CLI command"""
-    lengths = [
+YANDEX_MAPS_LENGTHS_BYTES = encode_jsonl([
         {'start': [37.84870228730142, 55.73853974696249], 'end': [37.8490418381989, 55.73832445777953],
          'edge_id': 8414926848168493057},
         {'start': [37.524768467992544, 55.88785375468433], 'end': [37.52415172755718, 55.88807155843824],
@@ -167,9 +161,9 @@ def test_yandex_maps_cli(runner: CliRunner) -> None:
          'edge_id': 7639557040160407543},
         {'start': [37.83196756616235, 55.76662947423756], 'end': [37.83191015012562, 55.766647034324706],
          'edge_id': 1293255682152955894},
-    ]
+])
 
-    times = [
+YANDEX_MAPS_TIMES_BYTES = encode_jsonl([
         {'leave_time': '20171020T112238.723000', 'enter_time': '20171020T112237.427000',
          'edge_id': 8414926848168493057},
         {'leave_time': '20171011T145553.040000', 'enter_time': '20171011T145551.957000',
@@ -186,43 +180,41 @@ def test_yandex_maps_cli(runner: CliRunner) -> None:
          'edge_id': 5342768494149337085},
         {'leave_time': '20171027T082600.201000', 'enter_time': '20171027T082557.571000',
          'edge_id': 5342768494149337085}
-    ]
+])
+
 
-    lengths_file = create_temp_file(lengths)
-    times_file = create_temp_file(times)
-    plot_file = Path(tempfile.mktemp(suffix='.png'))
+def test_yandex_maps_cli(runner: CliRunner, tmp_path: Path) -> None:
+    """Test inverted index CLI command"""
+    lengths_file = tmp_path / 'lengths.jsonl'
+    lengths_file.write_bytes(YANDEX_MAPS_LENGTHS_BYTES)
+    times_file = tmp_path / 'times.jsonl'
+    times_file.write_bytes(YANDEX_MAPS_TIMES_BYTES)
+    plot_file = tmp_path / 'plot.png'
     print(plot_file)
-    output_file = Path(tempfile.mktemp(suffix='.jsonl'))
-
-    try:
-        result = runner.invoke(
-            cli, ['yandex-maps', str(times_file), str(lengths_file), str(output_file), '--plot', '--plot-file', str(plot_file)])
-
-        print(result.exception)
-        print(result.exc_info)
-        print(result.stderr_bytes)
-        print(result.stdout_bytes)
-
-        assert result.exit_code == 0
-
-        # Check output file
-        with open(output_file, 'r') as f:
-            output = [json.loads(line) for line in f]
-
-        expected = [
-            {'weekday': 'Fri', 'hour': 8, 'speed': approx(62.2322, 0.001)},
-            {'weekday': 'Fri', 'hour': 9, 'speed': approx(78.1070, 0.001)},
-            {'weekday': 'Fri', 'hour': 11, 'speed': approx(88.9552, 0.001)},
-            {'weekday': 'Sat', 'hour': 13, 'speed': approx(100.9690, 0.001)},
-            {'weekday': 'Sun', 'hour': 13, 'speed': approx(21.8577, 0.001)},
-            {'weekday': 'Tue', 'hour': 6, 'speed': approx(105.3901, 0.001)},
-            {'weekday': 'Tue', 'hour': 14, 'speed': approx(41.5145, 0.001)},
-            {'weekday': 'Wed', 'hour': 14, 'speed': approx(106.4505, 0.001)}
-        ]
-
-        assert sorted(output, key=itemgetter('weekday', 'hour')) == expected
-
-    finally:
-        lengths_file.unlink(missing_ok=True)
-        times_file.unlink(missing_ok=True)
-        output_file.unlink(missing_ok=True)
+    output_file = tmp_path / 'out.jsonl'
+
+    result = runner.invoke(
+        cli, ['yandex-maps', str(times_file), str(lengths_file), str(output_file), '--plot', '--plot-file', str(plot_file)])
+
+    print(result.exception)
+    print(result.exc_info)
+    print(result.stderr_bytes)
+    print(result.stdout_bytes)
+
+    assert result.exit_code == 0
+
+    # Check output file
+    output = read_output(output_file)
+
+    expected = [
+        {'weekday': 'Fri', 'hour': 8, 'speed': approx(62.2322, 0.001)},
+        {'weekday': 'Fri', 'hour': 9, 'speed': approx(78.1070, 0.001)},
+        {'weekday': 'Fri', 'hour': 11, 'speed': approx(88.9552, 0.001)},
+        {'weekday': 'Sat', 'hour': 13, 'speed': approx(100.9690, 0.001)},
+        {'weekday': 'Sun', 'hour': 13, 'speed': approx(21.8577, 0.001)},
+        {'weekday': 'Tue', 'hour': 6, 'speed': approx(105.3901, 0.001)},
+        {'weekday': 'Tue', 'hour': 14, 'speed': approx(41.5145, 0.001)},
+        {'weekday': 'Wed', 'hour': 14, 'speed': approx(106.4505, 0.001)}
+    ]
+
+    assert sorted(output, key=itemgetter('weekday', 'hour')) == expected
@@ -1,4 +1,3 @@
-import copy
 import dataclasses
 import typing as tp
 
@@ -24,6 +23,14 @@ class MapCase:
     mapper_item: int = 0
     mapper_ground_truth_items: tuple[int, ...] = (0,)
 
+    def __post_init__(self) -> None:
+        # ground truth is fixed at parametrize time, so sort it once here
+        # instead of on every test run
+        self.key_func = _Key(*self.cmp_keys)
+        self.sorted_ground_truth = sorted(self.ground_truth, key=self.key_func)
+        self.sorted_mapper_ground_truth = sorted(
+            [self.ground_truth[i] for i in self.mapper_ground_truth_items], key=self.key_func)
+
 
 MAP_CASES = [
     MapCase(
@@ -81,21 +88,16 @@ MAP_CASES = [
 
 @pytest.mark.parametrize('case', MAP_CASES)
 def test_mapper(case: MapCase) -> None:
-    mapper_data_row = copy.deepcopy(case.data[case.mapper_item])
-    mapper_ground_truth_rows = [copy.deepcopy(
-        case.ground_truth[i]) for i in case.mapper_ground_truth_items]
-
-    key_func = _Key(*case.cmp_keys)
+    # mappers do not mutate their argument, so the rows are passed as is
+    key_func = case.key_func
 
-    mapper_result = case.mapper(mapper_data_row)
+    mapper_result = case.mapper(case.data[case.mapper_item])
     assert isinstance(mapper_result, tp.Iterator)
-    assert sorted(mapper_result, key=key_func) == sorted(
-        mapper_ground_truth_rows, key=key_func)
+    assert sorted(mapper_result, key=key_func) == case.sorted_mapper_ground_truth
 
     result = ops.Map(case.mapper)(iter(case.data))
     assert isinstance(result, tp.Iterator)
-    assert sorted(result, key=key_func) == sorted(
-        case.ground_truth, key=key_func)
+    assert sorted(result, key=key_func) == case.sorted_ground_truth
 
 
 @dataclasses.dataclass
@@ -108,6 +110,12 @@ class ReduceCase:
     reduce_data_items: tuple[int, ...] = (0,)
     reduce_ground_truth_items: tuple[int, ...] = (0,)
 
+    def __post_init__(self) -> None:
+        self.key_func = _Key(*self.cmp_keys)
+        self.sorted_ground_truth = sorted(self.ground_truth, key=self.key_func)
+        self.sorted_reduce_ground_truth = sorted(
+            [self.ground_truth[i] for i in self.reduce_ground_truth_items], key=self.key_func)
+
 
 REDUCE_CASES = [
     ReduceCase(
@@ -182,19 +190,14 @@ REDUCE_CASES = [
 
 @pytest.mark.parametrize('case', REDUCE_CASES)
 def test_reducer(case: ReduceCase) -> None:
-    reducer_data_rows = [copy.deepcopy(case.data[i])
-                         for i in case.reduce_data_items]
-    reducer_ground_truth_rows = [copy.deepcopy(
-        case.ground_truth[i]) for i in case.reduce_ground_truth_items]
+    reducer_data_rows = [case.data[i] for i in case.reduce_data_items]
 
-    key_func = _Key(*case.cmp_keys)
+    key_func = case.key_func
 
     reducer_result = case.reducer(case.reducer_keys, iter(reducer_data_rows))
     assert isinstance(reducer_result, tp.Iterator)
-    assert sorted(reducer_result, key=key_func) == sorted(
-        reducer_ground_truth_rows, key=key_func)
+    assert sorted(reducer_result, key=key_func) == case.sorted_reduce_ground_truth
 
     result = ops.Reduce(case.reducer, case.reducer_keys)(iter(case.data))
     assert isinstance(result, tp.Iterator)
-    assert sorted(result, key=key_func) == sorted(
-        case.ground_truth, key=key_func)
+    assert sorted(result, key=key_func) == case.sorted_ground_truth
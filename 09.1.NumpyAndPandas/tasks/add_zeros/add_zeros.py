@@ -8,6 +8,7 @@ def add_zeros(x: npt.NDArray[np.int_]) -> npt.NDArray[np.int_]:
     :param x: array,
     :return: array with zeros inserted
     """
-    result = np.zeros(max(0, x.size * 2 - 1), dtype=x.dtype)
+    result = np.empty(max(0, x.size * 2 - 1), dtype=x.dtype)
     result[::2] = x
+    result[1::2] = 0
     return result
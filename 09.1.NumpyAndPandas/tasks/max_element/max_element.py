@@ -9,6 +9,5 @@ def max_element(array: npt.NDArray[np.int_]) -> int | None:
     :param array: array,
     :return: max element value or None
     """
-    shift_array = np.roll(array, 1)
-    shift_array[0] = 1
-    return None if array[shift_array == 0].size == 0 else int(np.max(array[shift_array == 0]))
+    after_zero = np.flatnonzero(array[:-1] == 0) + 1
+    return None if after_zero.size == 0 else int(array[after_zero].max())
@@ -9,6 +9,7 @@ def nonzero_product(matrix: npt.NDArray[np.int_]) -> int | None:
     :param matrix: array,
     :return: product value or None
     """
-    if (np.sum(np.diag(matrix) != 0) == 0):
-        return None
-    return int(np.prod(np.diag(matrix)[np.diag(matrix) != 0]))
+    diag = np.diagonal(matrix)
+    nonzero = diag[diag != 0]
+    # .size is a constant-time check, unlike the old sum over the mask
+    return None if nonzero.size == 0 else int(nonzero.prod())
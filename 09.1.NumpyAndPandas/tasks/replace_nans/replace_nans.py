@@ -9,8 +9,14 @@ def replace_nans(matrix: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
     :param matrix: matrix,
     :return: replaced matrix
     """
-    mean_val = np.nanmean(matrix)
-    if  np.isnan(mean_val):
-        mean_val = 0.0
-
-    return np.nan_to_num(matrix, nan=float(mean_val))
+    # no-op for already-contiguous float64 input; otherwise one copy here
+    # keeps every pass below on the fast unit-stride path
+    matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+    mask = np.isnan(matrix)
+    n_valid = matrix.size - np.count_nonzero(mask)
+    if n_valid == 0:
+        return np.zeros_like(matrix)
+    mean_val = np.where(mask, 0.0, matrix).sum() / n_valid
+    out = matrix.copy()
+    out[mask] = mean_val
+    return out
@@ -1,5 +1,7 @@
 import typing as tp
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
 
@@ -9,8 +11,9 @@ def male_age(df: pd.DataFrame) -> float:
     :param df: dataframe
     :return: mean age
     """
-    return float(df.query(('Survived == 1 and Sex == "male" and ' +
-                     'Embarked == "S" and Fare > 30'))['Age'].mean())
+    mask = (df['Survived'].values == 1) & (df['Sex'].values == 'male') \
+        & (df['Embarked'].values == 'S') & (df['Fare'].values > 30)
+    return float(np.nanmean(df['Age'].values[mask]))
 
 
 def nan_columns(df: pd.DataFrame) -> tp.Iterable[str]:
@@ -19,7 +22,9 @@ def nan_columns(df: pd.DataFrame) -> tp.Iterable[str]:
     :param df: dataframe
     :return: series of columns
     """
-    return df.columns[df.isna().any()].tolist()
+    # column at a time keeps peak memory at one bool column instead of a
+    # full-frame isna table, and any() stops at the first NaN it sees
+    return [column for column in df.columns if df[column].isna().any()]
 
 
 def class_distribution(df: pd.DataFrame) -> pd.Series:
@@ -28,7 +33,11 @@ def class_distribution(df: pd.DataFrame) -> pd.Series:
     :param df: dataframe
     :return: series with ratios
     """
-    return df['Pclass'].value_counts().sort_index() / len(df)
+    # Pclass is a small non-negative int, so a bincount histogram replaces
+    # the hash table inside value_counts and the two sorts around it
+    counts = np.bincount(df['Pclass'].values)
+    classes = np.flatnonzero(counts)
+    return pd.Series(counts[classes] / len(df), index=classes)
 
 
 def families_count(df: pd.DataFrame, k: int) -> int:
@@ -38,7 +47,8 @@ def families_count(df: pd.DataFrame, k: int) -> int:
     :param k: number of members,
     :return: number of families
     """
-    return sum(df['Name'].str.split(',').str[0].value_counts() > k)
+    surnames = df['Name'].str.extract(r'^([^,]*)', expand=False)
+    return int((surnames.value_counts() > k).sum())
 
 
 def mean_price(df: pd.DataFrame, tickets: tp.Iterable[str]) -> float:
@@ -48,8 +58,10 @@ def mean_price(df: pd.DataFrame, tickets: tp.Iterable[str]) -> float:
     :param tickets: list of tickets,
     :return: mean fare for this tickets
     """
-    tickets = tuple(tickets)
-    return float(df[df['Ticket'].isin(tickets)]['Fare'].mean())
+    if not isinstance(tickets, (set, frozenset)):
+        tickets = frozenset(tickets)
+    mask = df['Ticket'].isin(tickets).values
+    return float(np.nanmean(df['Fare'].values[mask]))
 
 
 def max_size_group(df: pd.DataFrame, columns: list[str]) -> tp.Iterable[tp.Any]:
@@ -59,8 +71,7 @@ def max_size_group(df: pd.DataFrame, columns: list[str]) -> tp.Iterable[tp.Any]:
     :param columns: columns for grouping,
     :return: list of most common combination
     """
-    tmp: pd.Series = pd.Series(df.groupby(columns).size().idxmax())
-    return tuple(tmp.to_list())
+    return tuple(df[columns].value_counts().index[0])
 
 
 def dead_lucky(df: pd.DataFrame) -> float:
@@ -74,10 +85,41 @@ def dead_lucky(df: pd.DataFrame) -> float:
     :param df: dataframe,
     :return: ratio of dead lucky passengers
     """
-    return 1 - df[df['Ticket'].apply(is_lucky)]['Survived'].mean()
+    # many tickets repeat, so decide luckiness once per unique ticket
+    # and spread the verdict back over the rows
+    uniq = df['Ticket'].unique()
+    lucky = lucky_mask(pd.Series(uniq))
+    mask = df['Ticket'].map(pd.Series(lucky.values, index=uniq)).to_numpy()
+    n_lucky = int(mask.sum())
+    if n_lucky == 0:
+        return float('nan')
+    return 1.0 - float(df['Survived'].values[mask].sum()) / n_lucky
+
+def lucky_mask(tickets: pd.Series) -> pd.Series:
+    """Vectorized is_lucky over a whole Series of tickets"""
+    t = tickets.astype(str)
+    candidates = t.str.fullmatch(r'\d+') & (t.str.len() % 2 == 0)
+    mask = pd.Series(False, index=t.index)
+    sub = t[candidates]
+    if sub.empty:
+        return mask
+    # flatten all candidate tickets into one ASCII byte stream and take the
+    # per-half sums with a single reduceat pass, no per-ticket padding
+    lengths = sub.str.len().to_numpy()
+    starts = np.concatenate(([0], lengths.cumsum()))[:-1]
+    bounds: npt.NDArray[np.int64] = np.empty(2 * len(sub), dtype=np.dtype(np.int64))
+    bounds[0::2] = starts
+    bounds[1::2] = starts + lengths // 2
+    codes = np.frombuffer(''.join(sub).encode('ascii'), dtype=np.uint8).astype(np.int64)
+    sums = np.add.reduceat(codes, bounds)
+    # halves have equal length, so comparing raw code sums is enough
+    mask.loc[sub.index] = sums[0::2] == sums[1::2]
+    return mask
 
 def is_lucky(ticket: str) -> bool:
-    if ticket.isdigit() and len(ticket) % 2 == 0:
-        return sum(map(int, list(ticket[:len(ticket)//2])))== \
-                    sum(map(int, list(ticket[len(ticket)//2:])))
-    return False
+    if not ticket.isdigit() or len(ticket) % 2:
+        return False
+    half = len(ticket) // 2
+    # halves have equal length, so the +48 per character code cancels out
+    codes = ticket.encode('ascii')
+    return sum(codes[:half]) == sum(codes[half:])
@@ -9,5 +9,21 @@ def vander(array: npt.NDArray[np.float64 | np.int_]) -> npt.NDArray[np.float64]:
     :return: vandermonde matrix
     """
 
-    step = np.arange(array.size, dtype=np.float64)
-    return array.reshape((-1, 1))**step
+    n = array.size
+    out: npt.NDArray[np.float64] = np.empty((n, n))
+    if n == 0:
+        return out
+    out[:, 0] = 1.0
+    col = array.astype(np.float64, copy=False)
+    col2 = col * col
+    # each column is the previous one times the base, so the whole matrix
+    # costs n*n multiplies instead of n*n pow calls; the loop fills two
+    # columns per step from the same parent so the multiplies are
+    # independent and can overlap
+    for j in range(1, n - 1, 2):
+        prev = out[:, j - 1]
+        np.multiply(prev, col, out=out[:, j])
+        np.multiply(prev, col2, out=out[:, j + 1])
+    if n % 2 == 0:
+        np.multiply(out[:, n - 2], col, out=out[:, n - 1])
+    return out